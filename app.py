@@ -2,91 +2,35 @@
 # Install: pip install flask python-dotenv
 
 import os
-import json
+import argparse
+import threading
+import time
 from datetime import datetime
-from flask import Flask, render_template_string, request, redirect, url_for, session
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify
+from jinja2 import DictLoader
 from functools import wraps
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (before the modules below read their settings)
 load_dotenv()
 
+import sitegen
+import posts_io
+from sitegen import build_site, create_slug
+from storage import StaleEditError, open_storage
+
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'change-this-secret-key-in-production')
 
 # Configuration
-OUTPUT_DIR = 'public'
-DATA_FILE = 'site_data.json'
+BUILD_DEBOUNCE = float(os.getenv('BUILD_DEBOUNCE', '1.0'))  # seconds to wait for more edits
+ADMIN_PAGE_SIZE = int(os.getenv('ADMIN_PAGE_SIZE', '25'))  # posts per page in the admin post list
 ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
 
 # Create directories
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(os.path.join(OUTPUT_DIR, 'blog'), exist_ok=True)
-
-# Initialize data file with default content
-DEFAULT_DATA = {
-    'site_info': {
-        'name': 'Mamdhooh Moomin Rasheed',
-        'title': 'Pentester & Developer',
-        'description': 'Penetration tester and developer with a lifelong passion for breaking systems to build them better.',
-        'email': 'contact@mamdhooh.com',
-        'twitter': '@moominrasheed',
-        'domain': 'mamdhooh.com'
-    },
-    'hero': {
-        'tag': '🛡️ Security · Development · Innovation',
-        'title': 'Mamdhooh Moomin Rasheed',
-        'description': 'Penetration tester and developer with a lifelong passion for breaking systems to build them better. I find vulnerabilities, write code, and secure the digital world one exploit at a time.'
-    },
-    'footer': {
-        'text': '© 2025 Mamdhooh Moomin Rasheed. Built for speed and security.',
-        'tagline': 'root@mamdhooh:~$ whoami'
-    },
-    'expertise': [
-        {
-            'icon': '🔒',
-            'title': 'Penetration Testing',
-            'description': 'Comprehensive security assessments, vulnerability research, and exploit development. I think like an attacker to defend like a pro.'
-        },
-        {
-            'icon': '💻',
-            'title': 'Full-Stack Development',
-            'description': 'Building secure, scalable applications from frontend to backend. Security-first development is not just a practice, it\'s a mindset.'
-        },
-        {
-            'icon': '🔍',
-            'title': 'Security Research',
-            'description': 'Discovering zero-days, analyzing attack vectors, and contributing to the security community with responsible disclosure.'
-        },
-        {
-            'icon': '⚡',
-            'title': 'DevSecOps',
-            'description': 'Integrating security into every stage of development. Automation, CI/CD pipelines, and security tooling that scales.'
-        },
-        {
-            'icon': '🎯',
-            'title': 'Red Team Operations',
-            'description': 'Simulating real-world attacks to test defenses. Social engineering, network penetration, and physical security assessments.'
-        },
-        {
-            'icon': '🛠️',
-            'title': 'Tool Development',
-            'description': 'Creating custom security tools and automation scripts. If it doesn\'t exist, I\'ll build it myself.'
-        }
-    ],
-    'skills': [
-        'Python', 'JavaScript', 'Go', 'Bash', 'React', 'Node.js',
-        'Burp Suite', 'Metasploit', 'Nmap', 'Wireshark', 'Docker',
-        'Kubernetes', 'AWS', 'Linux', 'OWASP', 'Web Application Security',
-        'Network Security', 'Reverse Engineering', 'Binary Exploitation', 'API Security'
-    ],
-    'posts': []
-}
-
-if not os.path.exists(DATA_FILE):
-    with open(DATA_FILE, 'w') as f:
-        json.dump(DEFAULT_DATA, f, indent=2)
+os.makedirs(sitegen.OUTPUT_DIR, exist_ok=True)
+os.makedirs(os.path.join(sitegen.OUTPUT_DIR, 'blog'), exist_ok=True)
 
 # Authentication decorator
 def login_required(f):
@@ -97,436 +41,89 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-# Load/Save data
-def load_data():
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
-
-def save_data(data):
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
-# Base CSS (minified for speed)
-BASE_CSS = '''*{margin:0;padding:0;box-sizing:border-box}:root{--bg:#0a0a0a;--card:#1a1a1a;--text:#fff;--text-dim:#a0a0a0;--accent:#00ff88;--border:#2a2a2a}body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:var(--bg);color:var(--text);line-height:1.6}
-.grid-bg{position:fixed;top:0;left:0;width:100%;height:100%;background-image:linear-gradient(var(--accent) 1px,transparent 1px),linear-gradient(90deg,var(--accent) 1px,transparent 1px);background-size:50px 50px;opacity:.03;pointer-events:none;animation:grid 20s linear infinite}
-@keyframes grid{0%{transform:translate(0,0)}100%{transform:translate(50px,50px)}}
-nav{position:fixed;top:0;width:100%;background:rgba(10,10,10,.8);backdrop-filter:blur(20px);border-bottom:1px solid var(--border);z-index:1000;padding:1.5rem 2rem}
-.nav-content{max-width:1400px;margin:0 auto;display:flex;justify-content:space-between;align-items:center}
-.logo{font-size:1.5rem;font-weight:700;color:var(--accent);letter-spacing:-.5px;text-decoration:none}
-.nav-links{display:flex;gap:2rem;list-style:none}
-.nav-links a{color:var(--text-dim);text-decoration:none;font-weight:500;transition:color .3s}
-.nav-links a:hover{color:var(--accent)}
-.container{max-width:1400px;margin:0 auto;padding:0 2rem;position:relative;z-index:1}
-.hero{min-height:100vh;display:flex;align-items:center;padding-top:80px}
-.hero-tag{display:inline-block;padding:.5rem 1rem;background:rgba(0,255,136,.1);border:1px solid var(--accent);border-radius:50px;color:var(--accent);font-size:.9rem;font-weight:600;margin-bottom:2rem}
-h1{font-size:clamp(3rem,8vw,6rem);font-weight:800;line-height:1.1;margin-bottom:1.5rem;background:linear-gradient(135deg,#fff 0%,var(--accent) 100%);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text}
-.hero-description{font-size:1.3rem;color:var(--text-dim);margin-bottom:3rem;line-height:1.8}
-.cta-buttons{display:flex;gap:1rem;flex-wrap:wrap}
-.btn{padding:1rem 2rem;border-radius:12px;text-decoration:none;font-weight:600;transition:all .3s;display:inline-flex;align-items:center;gap:.5rem}
-.btn-primary{background:var(--accent);color:var(--bg);border:2px solid var(--accent)}
-.btn-primary:hover{background:transparent;color:var(--accent);transform:translateY(-2px);box-shadow:0 10px 40px rgba(0,255,136,.3)}
-.btn-secondary{background:transparent;color:var(--text);border:2px solid var(--border)}
-.btn-secondary:hover{border-color:var(--accent);color:var(--accent);transform:translateY(-2px)}
-section{padding:8rem 0}
-.section-header{text-align:center;margin-bottom:5rem}
-.section-tag{color:var(--accent);font-weight:600;font-size:.9rem;letter-spacing:2px;text-transform:uppercase;margin-bottom:1rem}
-h2{font-size:clamp(2.5rem,5vw,4rem);font-weight:800;margin-bottom:1rem}
-.section-description{font-size:1.2rem;color:var(--text-dim);max-width:600px;margin:0 auto}
-.expertise-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(300px,1fr));gap:2rem}
-.expertise-card{background:var(--card);border:1px solid var(--border);border-radius:20px;padding:2.5rem;transition:all .3s}
-.expertise-card:hover{transform:translateY(-5px);border-color:var(--accent);box-shadow:0 20px 60px rgba(0,255,136,.1)}
-.expertise-icon{font-size:3rem;margin-bottom:1.5rem}
-.expertise-card h3{font-size:1.5rem;margin-bottom:1rem}
-.expertise-card p{color:var(--text-dim);line-height:1.8}
-.skills-container{display:flex;flex-wrap:wrap;gap:1rem;justify-content:center;max-width:900px;margin:0 auto}
-.skill-tag{padding:.8rem 1.5rem;background:var(--card);border:1px solid var(--border);border-radius:50px;font-weight:500;transition:all .3s}
-.skill-tag:hover{background:rgba(0,255,136,.1);border-color:var(--accent);color:var(--accent);transform:translateY(-2px)}
-.blog-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(350px,1fr));gap:2rem}
-.blog-card{background:var(--card);border:1px solid var(--border);border-radius:20px;overflow:hidden;transition:all .3s;text-decoration:none;color:inherit;display:block}
-.blog-card:hover{transform:translateY(-8px);border-color:var(--accent);box-shadow:0 20px 60px rgba(0,255,136,.15)}
-.blog-image{height:200px;background:linear-gradient(135deg,#1a1a1a 0%,#2a2a2a 100%);display:flex;align-items:center;justify-content:center;font-size:4rem;border-bottom:1px solid var(--border)}
-.blog-content{padding:2rem}
-.blog-meta{display:flex;gap:1rem;margin-bottom:1rem;font-size:.85rem;color:var(--text-dim)}
-.blog-tag-small{color:var(--accent);font-weight:600}
-.blog-card h3{font-size:1.4rem;margin-bottom:.8rem;line-height:1.3}
-.blog-excerpt{color:var(--text-dim);line-height:1.7;margin-bottom:1.5rem}
-.read-more{color:var(--accent);font-weight:600;display:inline-flex;align-items:center;gap:.5rem}
-.contact-content{max-width:700px;margin:0 auto;text-align:center}
-.contact-links{display:flex;gap:1.5rem;justify-content:center;flex-wrap:wrap;margin-top:3rem}
-.contact-link{display:flex;align-items:center;gap:.8rem;padding:1.2rem 2rem;background:var(--card);border:1px solid var(--border);border-radius:15px;color:var(--text);text-decoration:none;font-weight:600;transition:all .3s}
-.contact-link:hover{border-color:var(--accent);background:rgba(0,255,136,.05);transform:translateY(-3px);box-shadow:0 10px 40px rgba(0,255,136,.2)}
-footer{border-top:1px solid var(--border);padding:3rem 0;text-align:center;color:var(--text-dim)}
-.terminal{font-family:'Courier New',monospace;color:var(--accent);margin-bottom:1rem}
-.article{padding:10rem 0 5rem}
-.back-link{display:inline-flex;align-items:center;gap:.5rem;color:var(--text-dim);text-decoration:none;margin-bottom:3rem;transition:color .3s}
-.back-link:hover{color:var(--accent)}
-.article-icon{font-size:5rem;margin-bottom:2rem}
-.article-meta{display:flex;flex-wrap:wrap;gap:1rem;margin-bottom:2rem;font-size:.9rem;color:var(--text-dim)}
-.article-category{color:var(--accent);font-weight:600}
-.article-content{font-size:1.1rem;line-height:1.9}
-.article-content h2{font-size:2rem;margin:3rem 0 1rem;color:var(--accent)}
-.article-content h3{font-size:1.5rem;margin:2rem 0 1rem}
-.article-content p{margin:1.5rem 0;color:var(--text-dim)}
-.article-content ul,.article-content ol{margin:1.5rem 0;padding-left:2rem}
-.article-content li{margin:.5rem 0;color:var(--text-dim)}
-.article-content code{background:var(--card);padding:.2rem .5rem;border-radius:4px;color:var(--accent);font-family:'Courier New',monospace}
-.article-content pre{background:var(--card);padding:1.5rem;border-radius:8px;overflow-x:auto;margin:1.5rem 0;border:1px solid var(--border)}
-.article-content pre code{background:none;padding:0}
-.article-content blockquote{border-left:4px solid var(--accent);padding-left:1.5rem;margin:1.5rem 0;font-style:italic;color:var(--text-dim)}
-@media(max-width:768px){nav{padding:1rem}.nav-links{gap:1rem;font-size:.9rem}section{padding:4rem 0}.expertise-grid,.blog-grid{grid-template-columns:1fr}.contact-links{flex-direction:column}}'''
-
-# HTML Templates
-def generate_index_html(data):
-    # Get only the first published post for homepage
-    published_posts = [p for p in data['posts'] if p.get('published', True)]
-    featured_post = published_posts[0] if published_posts else None
-    
-    featured_blog = ''
-    if featured_post:
-        featured_blog = f'''
-        <section id="blog">
-            <div class="section-header">
-                <div class="section-tag">Latest Insight</div>
-                <h2>Featured Post</h2>
-            </div>
-            <div style="max-width:800px;margin:0 auto">
-                <a href="blog/{featured_post["slug"]}.html" class="blog-card">
-                    <div class="blog-image">{featured_post["icon"]}</div>
-                    <div class="blog-content">
-                        <div class="blog-meta">
-                            <span class="blog-tag-small">{featured_post["category"]}</span>
-                            <span>•</span>
-                            <span>{featured_post["date"]}</span>
-                            <span>•</span>
-                            <span>{featured_post["read_time"]}</span>
-                        </div>
-                        <h3>{featured_post["title"]}</h3>
-                        <p class="blog-excerpt">{featured_post["excerpt"]}</p>
-                        <span class="read-more">Read More →</span>
-                    </div>
-                </a>
-                <div style="text-align:center;margin-top:2rem">
-                    <a href="blog.html" class="btn btn-secondary">View All Posts →</a>
-                </div>
-            </div>
-        </section>'''
-    
-    expertise_cards = ''
-    for item in data['expertise']:
-        expertise_cards += f'''
-                <div class="expertise-card">
-                    <div class="expertise-icon">{item["icon"]}</div>
-                    <h3>{item["title"]}</h3>
-                    <p>{item["description"]}</p>
-                </div>'''
-    
-    skills_tags = ''.join([f'<span class="skill-tag">{skill}</span>' for skill in data['skills']])
-    
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data["site_info"]["name"]} - {data["site_info"]["title"]}</title>
-    <meta name="description" content="{data["site_info"]["description"]}">
-    <style>{BASE_CSS}</style>
-</head>
-<body>
-    <div class="grid-bg"></div>
-    
-    <nav>
-        <div class="nav-content">
-            <a href="index.html" class="logo">MR.</a>
-            <ul class="nav-links">
-                <li><a href="#home">Home</a></li>
-                <li><a href="#expertise">Expertise</a></li>
-                <li><a href="#skills">Skills</a></li>
-                <li><a href="blog.html">Blog</a></li>
-                <li><a href="#contact">Contact</a></li>
-            </ul>
-        </div>
-    </nav>
-
-    <div class="container">
-        <section class="hero" id="home">
-            <div class="hero-content">
-                <div class="hero-tag">{data["hero"]["tag"]}</div>
-                <h1>{data["hero"]["title"]}</h1>
-                <p class="hero-description">{data["hero"]["description"]}</p>
-                <div class="cta-buttons">
-                    <a href="#contact" class="btn btn-primary">Get in Touch<span>→</span></a>
-                    <a href="https://x.com/{data["site_info"]["twitter"][1:]}" target="_blank" class="btn btn-secondary">Follow on X</a>
-                </div>
-            </div>
-        </section>
-
-        <section id="expertise">
-            <div class="section-header">
-                <div class="section-tag">What I Do</div>
-                <h2>Expertise</h2>
-                <p class="section-description">Bridging the gap between security and development with deep technical knowledge</p>
-            </div>
-            <div class="expertise-grid">{expertise_cards}</div>
-        </section>
-
-        <section id="skills">
-            <div class="section-header">
-                <div class="section-tag">Tech Stack</div>
-                <h2>Skills & Tools</h2>
-            </div>
-            <div class="skills-container">{skills_tags}</div>
-        </section>
-
-        {featured_blog}
-
-        <section id="contact">
-            <div class="contact-content">
-                <div class="section-header">
-                    <div class="section-tag">Let's Connect</div>
-                    <h2>Get in Touch</h2>
-                    <p class="section-description">Whether it's a security consultation, collaboration opportunity, or just a chat about the latest CVE</p>
-                </div>
-                <div class="contact-links">
-                    <a href="https://x.com/{data["site_info"]["twitter"][1:]}" target="_blank" class="contact-link"><span>𝕏</span><span>{data["site_info"]["twitter"]}</span></a>
-                    <a href="mailto:{data["site_info"]["email"]}" class="contact-link"><span>✉️</span><span>{data["site_info"]["email"]}</span></a>
-                </div>
-            </div>
-        </section>
-    </div>
-
-    <footer>
-        <div class="container">
-            <p class="terminal">{data["footer"]["tagline"]}</p>
-            <p>{data["footer"]["text"]}</p>
-        </div>
-    </footer>
-</body>
-</html>'''
-
-def generate_blog_page_html(data):
-    """Generate the main blog listing page"""
-    blog_cards = ''
-    for post in [p for p in data['posts'] if p.get('published', True)]:
-        blog_cards += f'''
-                <a href="blog/{post["slug"]}.html" class="blog-card">
-                    <div class="blog-image">{post["icon"]}</div>
-                    <div class="blog-content">
-                        <div class="blog-meta">
-                            <span class="blog-tag-small">{post["category"]}</span>
-                            <span>•</span>
-                            <span>{post["date"]}</span>
-                            <span>•</span>
-                            <span>{post["read_time"]}</span>
-                        </div>
-                        <h3>{post["title"]}</h3>
-                        <p class="blog-excerpt">{post["excerpt"]}</p>
-                        <span class="read-more">Read More →</span>
-                    </div>
-                </a>'''
-    
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Blog - {data["site_info"]["name"]}</title>
-    <meta name="description" content="Security insights, development tips, and penetration testing techniques">
-    <style>{BASE_CSS}</style>
-</head>
-<body>
-    <div class="grid-bg"></div>
-    
-    <nav>
-        <div class="nav-content">
-            <a href="index.html" class="logo">MR.</a>
-            <ul class="nav-links">
-                <li><a href="index.html">Home</a></li>
-                <li><a href="index.html#expertise">Expertise</a></li>
-                <li><a href="index.html#skills">Skills</a></li>
-                <li><a href="blog.html">Blog</a></li>
-                <li><a href="index.html#contact">Contact</a></li>
-            </ul>
-        </div>
-    </nav>
-
-    <div class="container" style="padding-top:120px">
-        <section style="padding:4rem 0">
-            <div class="section-header">
-                <div class="section-tag">Latest Insights</div>
-                <h2>All Blog Posts</h2>
-                <p class="section-description">Thoughts on security, development, and breaking things the right way</p>
-            </div>
-            <div class="blog-grid">{blog_cards}</div>
-        </section>
-    </div>
+storage = open_storage()
+sitegen.set_state_dir(storage.path)
 
-    <footer>
-        <div class="container">
-            <p class="terminal">{data["footer"]["tagline"]}</p>
-            <p>{data["footer"]["text"]}</p>
-        </div>
-    </footer>
-</body>
-</html>'''
-
-def generate_post_html(post, site_info, footer):
-    content_html = markdown_to_html(post['content'])
-    
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{post["title"]} - {site_info["name"]}</title>
-    <meta name="description" content="{post["excerpt"]}">
-    <style>{BASE_CSS}</style>
-</head>
-<body>
-    <div class="grid-bg"></div>
-    
-    <nav>
-        <div class="nav-content">
-            <a href="../index.html" class="logo">MR.</a>
-            <ul class="nav-links">
-                <li><a href="../index.html">Home</a></li>
-                <li><a href="../index.html#blog">Blog</a></li>
-                <li><a href="../index.html#contact">Contact</a></li>
-            </ul>
-        </div>
-    </nav>
-
-    <div class="container">
-        <article class="article">
-            <a href="../index.html#blog" class="back-link">← Back to Blog</a>
-            <div class="article-icon">{post["icon"]}</div>
-            <div class="article-meta">
-                <span class="article-category">{post["category"]}</span>
-                <span>•</span>
-                <span>{post["date"]}</span>
-                <span>•</span>
-                <span>{post["read_time"]}</span>
-            </div>
-            <h1>{post["title"]}</h1>
-            <div class="article-content">{content_html}</div>
-        </article>
-    </div>
-
-    <footer>
-        <div class="container">
-            <p>© 2025 {site_info["name"]}</p>
-        </div>
-    </footer>
-</body>
-</html>'''
-
-def markdown_to_html(text):
-    """Simple markdown to HTML converter"""
-    html = ''
-    lines = text.split('\n')
-    in_code_block = False
-    in_list = False
-    code_block = ''
-    list_type = ''
-    
-    for line in lines:
-        # Code blocks
-        if line.strip().startswith('```'):
-            if in_code_block:
-                html += f'<pre><code>{code_block.strip()}</code></pre>'
-                code_block = ''
-                in_code_block = False
-            else:
-                in_code_block = True
-            continue
-        
-        if in_code_block:
-            code_block += line + '\n'
-            continue
-        
-        # Headers
-        if line.startswith('# '):
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-            html += f'<h2>{line[2:]}</h2>'
-        elif line.startswith('## '):
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-            html += f'<h2>{line[3:]}</h2>'
-        elif line.startswith('### '):
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-            html += f'<h3>{line[4:]}</h3>'
-        # Lists
-        elif line.strip().startswith('- ') or line.strip().startswith('* '):
-            if not in_list:
-                html += '<ul>'
-                in_list = True
-                list_type = 'ul'
-            html += f'<li>{line.strip()[2:]}</li>'
-        elif line.strip() and line.strip()[0].isdigit() and '. ' in line:
-            if not in_list:
-                html += '<ol>'
-                in_list = True
-                list_type = 'ol'
-            html += f'<li>{line.strip().split(".", 1)[1].strip()}</li>'
-        # Blockquote
-        elif line.strip().startswith('>'):
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-            html += f'<blockquote>{line.strip()[1:].strip()}</blockquote>'
-        # Paragraph
-        elif line.strip():
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-            # Bold
-            while '**' in line:
-                line = line.replace('**', '<strong>', 1).replace('**', '</strong>', 1)
-            # Italic
-            while '_' in line and line.count('_') >= 2:
-                line = line.replace('_', '<em>', 1).replace('_', '</em>', 1)
-            # Inline code
-            while '`' in line and line.count('`') >= 2:
-                line = line.replace('`', '<code>', 1).replace('`', '</code>', 1)
-            html += f'<p>{line}</p>'
-        else:
-            if in_list:
-                html += f'</{list_type}>'
-                in_list = False
-    
-    if in_list:
-        html += f'</{list_type}>'
-    
-    return html
+# Load data
+def load_data():
+    return storage.load()
+
+# Background builds
+class BuildQueue:
+    """Runs generate_site() on a background thread so admin requests return at once.
+
+    Requests made within BUILD_DEBOUNCE seconds of each other are coalesced
+    into a single build, and a request that arrives while a build is running
+    queues exactly one follow-up build.
+    """
+
+    def __init__(self, debounce):
+        self.debounce = debounce
+        self.condition = threading.Condition()
+        self.thread = None
+        self.pending = False
+        self.options = {}
+        self.last_request = 0
+        self.status = {
+            'state': 'idle',  # idle, pending or running
+            'queued': 0,
+            'last_started': None,
+            'last_duration': None,
+            'last_report': None,
+            'last_error': None
+        }
 
-def create_slug(title):
-    """Create URL-friendly slug from title"""
-    slug = title.lower()
-    slug = ''.join(c if c.isalnum() or c.isspace() else '' for c in slug)
-    slug = '-'.join(slug.split())
-    return slug
-
-def generate_site():
-    """Generate all static HTML files"""
-    data = load_data()
-    
-    # Generate index.html
-    with open(os.path.join(OUTPUT_DIR, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(generate_index_html(data))
-    
-    # Generate blog.html (all posts page)
-    with open(os.path.join(OUTPUT_DIR, 'blog.html'), 'w', encoding='utf-8') as f:
-        f.write(generate_blog_page_html(data))
-    
-    # Generate individual blog posts
-    for post in [p for p in data['posts'] if p.get('published', True)]:
-        post_html = generate_post_html(post, data['site_info'], data['footer'])
-        with open(os.path.join(OUTPUT_DIR, 'blog', f"{post['slug']}.html"), 'w', encoding='utf-8') as f:
-            f.write(post_html)
+    def schedule(self, full=False, jobs=None, pool=None):
+        with self.condition:
+            self.pending = True
+            self.options['full'] = self.options.get('full', False) or full
+            if jobs is not None:
+                self.options['jobs'] = jobs
+            if pool:
+                self.options['pool'] = pool
+            self.last_request = time.monotonic()
+            self.status['queued'] += 1
+            if self.status['state'] == 'idle':
+                self.status['state'] = 'pending'
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='site-builder', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                # Wait until edits stop arriving for the debounce window
+                while (remaining := self.last_request + self.debounce - time.monotonic()) > 0:
+                    self.condition.wait(remaining)
+                options, self.options, self.pending = self.options, {}, False
+                self.status.update(state='running', queued=0, last_started=datetime.now().isoformat(timespec='seconds'))
+
+            started = time.perf_counter()
+            report, error = None, None
+            try:
+                report = build_site(load_data, **options)
+            except Exception as e:
+                app.logger.exception('Background site build failed')
+                error = str(e)
+
+            with self.condition:
+                self.status.update(
+                    state='pending' if self.pending else 'idle',
+                    last_duration=round(time.perf_counter() - started, 3),
+                    last_report=report and {key: value if isinstance(value, int) else len(value)
+                                            for key, value in report.items()
+                                            if key in ('rendered', 'written', 'skipped', 'removed')},
+                    last_error=error
+                )
+
+    def snapshot(self):
+        with self.condition:
+            return dict(self.status)
+
+builder = BuildQueue(BUILD_DEBOUNCE)
 
 # Admin Templates
 ADMIN_CSS = '''*{margin:0;padding:0;box-sizing:border-box}body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:#0a0a0a;color:#fff;line-height:1.6;padding:2rem}
@@ -566,7 +163,17 @@ ADMIN_DASHBOARD = '''<!DOCTYPE html>
 <html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>CMS Dashboard</title><style>''' + ADMIN_CSS + '''</style></head>
 <body><div class="container">
-<div class="nav-top"><h1>🎨 Portfolio CMS</h1><a href="/admin/logout" class="btn btn-danger">Logout</a></div>
+<div class="nav-top"><h1>🎨 Portfolio CMS</h1>
+<div style="display:flex;align-items:center;gap:1rem">
+<span id="build-status" data-state="{{ build.state }}" style="color:#a0a0a0">Build: {{ build.state }}{% if build.last_duration is not none %} · last took {{ build.last_duration }}s{% endif %}{% if build.last_error %} · failed: {{ build.last_error }}{% endif %}</span>
+<a href="/admin/metrics" class="btn btn-secondary">Metrics</a>
+<a href="/admin/logout" class="btn btn-danger">Logout</a>
+</div></div>
+<script>
+(function poll(){var el=document.getElementById('build-status');if(el.dataset.state==='idle')return;
+setTimeout(function(){fetch('/admin/build-status').then(function(r){return r.json()}).then(function(b){
+el.dataset.state=b.state;el.textContent='Build: '+b.state+(b.last_duration!==null?' · last took '+b.last_duration+'s':'')+(b.last_error?' · failed: '+b.last_error:'');poll()})},1500)})();
+</script>
 {% if message %}<div class="success">{{ message }}</div>{% endif %}
 <div class="tabs">
 <div class="tab {% if tab == 'site' %}active{% endif %}" onclick="location.href='/admin?tab=site'">Site Settings</div>
@@ -587,6 +194,7 @@ ADMIN_DASHBOARD = '''<!DOCTYPE html>
 <div class="form-group"><label>Email</label><input type="email" name="email" value="{{ site_info.email }}" required></div>
 <div class="form-group"><label>Twitter</label><input type="text" name="twitter" value="{{ site_info.twitter }}" required></div>
 </div>
+<div class="form-group"><label>Posts per Blog Page (0 = single page)</label><input type="number" name="posts_per_page" min="0" value="{{ posts_per_page }}" required></div>
 <button type="submit" class="btn">💾 Save Site Settings</button>
 </div>
 </form>
@@ -645,12 +253,47 @@ ADMIN_DASHBOARD = '''<!DOCTYPE html>
 
 {% if tab == 'blog' %}
 <div style="display:flex;justify-content:space-between;align-items:center">
-<h2>Blog Posts ({{ posts|length }})</h2>
+<h2>Blog Posts ({{ total }})</h2>
 <div>
-<a href="/admin/regenerate" class="btn btn-secondary">🔄 Regenerate Site</a>
+<form method="GET" action="/admin/regenerate" style="display:inline-flex;align-items:center;gap:.5rem">
+<input type="number" name="jobs" min="0" value="{{ build_jobs }}" title="Worker count (0 = one per CPU)" style="width:5rem">
+<select name="pool" style="width:auto">
+<option value="process" {% if build_pool == 'process' %}selected{% endif %}>Processes</option>
+<option value="thread" {% if build_pool == 'thread' %}selected{% endif %}>Threads</option>
+</select>
+<button type="submit" class="btn btn-secondary">🔄 Regenerate Site</button>
+</form>
 <a href="/admin/new-post" class="btn">+ New Post</a>
 </div>
 </div>
+<form method="GET" action="/admin" class="card" style="display:flex;align-items:center;gap:.5rem;flex-wrap:wrap;margin-top:1rem">
+<input type="hidden" name="tab" value="blog">
+<input type="search" name="q" value="{{ filters.q }}" placeholder="Search titles" style="flex:1;min-width:12rem">
+<select name="category" style="width:auto">
+<option value="">All categories</option>
+{% for category in categories %}<option value="{{ category }}" {% if filters.category == category %}selected{% endif %}>{{ category }}</option>{% endfor %}
+</select>
+<select name="status" style="width:auto">
+<option value="">All posts</option>
+<option value="published" {% if filters.status == 'published' %}selected{% endif %}>Published</option>
+<option value="draft" {% if filters.status == 'draft' %}selected{% endif %}>Drafts</option>
+</select>
+<select name="sort" style="width:auto">
+<option value="date" {% if filters.sort == 'date' %}selected{% endif %}>By date</option>
+<option value="title" {% if filters.sort == 'title' %}selected{% endif %}>By title</option>
+<option value="id" {% if filters.sort == 'id' %}selected{% endif %}>By creation</option>
+</select>
+<select name="order" style="width:auto">
+<option value="desc" {% if filters.order == 'desc' %}selected{% endif %}>Descending</option>
+<option value="asc" {% if filters.order == 'asc' %}selected{% endif %}>Ascending</option>
+</select>
+<button type="submit" class="btn btn-secondary">Filter</button>
+</form>
+<form method="POST" action="/admin/import-posts" enctype="multipart/form-data" class="card" style="display:flex;align-items:center;gap:.5rem;flex-wrap:wrap">
+<input type="file" name="files" multiple accept=".ndjson,.jsonl,.md" title="NDJSON files, or Markdown files with front matter" style="flex:1;min-width:12rem">
+<button type="submit" class="btn btn-secondary">Import Posts</button>
+<a href="/admin/export-posts" class="btn btn-secondary">Export NDJSON</a>
+</form>
 <div class="item-list">
 {% for post in posts %}
 <div class="card item">
@@ -668,6 +311,13 @@ ADMIN_DASHBOARD = '''<!DOCTYPE html>
 </div>
 {% endfor %}
 </div>
+{% if pages > 1 %}
+<div style="display:flex;justify-content:space-between;align-items:center;margin-top:2rem">
+{% if page > 1 %}<a href="{{ url_for('admin_dashboard', tab='blog', page=page - 1, **filter_args) }}" class="btn btn-secondary">← Previous</a>{% else %}<span></span>{% endif %}
+<span style="color:#a0a0a0">Page {{ page }} of {{ pages }}</span>
+{% if page < pages %}<a href="{{ url_for('admin_dashboard', tab='blog', page=page + 1, **filter_args) }}" class="btn btn-secondary">Next →</a>{% else %}<span></span>{% endif %}
+</div>
+{% endif %}
 {% endif %}
 
 </div></body></html>'''
@@ -704,7 +354,9 @@ ADMIN_EDIT_POST = '''<!DOCTYPE html>
 <body><div class="container">
 <a href="/admin?tab=blog" style="color:#00ff88;text-decoration:none">← Back to Blog</a>
 <h1>{% if post %}Edit Post{% else %}New Post{% endif %}</h1>
+{% if error %}<div style="background:#ff4444;color:#fff;padding:1rem;border-radius:8px;margin-bottom:1rem">{{ error }}</div>{% endif %}
 <form method="POST">
+{% if post %}<input type="hidden" name="version" value="{{ post.version or 0 }}">{% endif %}
 <div class="card">
 <div class="grid-2">
 <div class="form-group">
@@ -754,6 +406,84 @@ ADMIN_EDIT_POST = '''<!DOCTYPE html>
 </form>
 </div></body></html>'''
 
+ADMIN_METRICS = '''<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Build Metrics</title><style>''' + ADMIN_CSS + '''td.num{text-align:right;font-family:monospace}</style></head>
+<body><div class="container">
+<a href="/admin?tab=blog" style="color:#00ff88;text-decoration:none">← Back to Dashboard</a>
+<h1>📈 Last Build</h1>
+{% if not report %}
+<div class="card"><p>No build report yet. It is written after every build to {{ report_file }}.</p></div>
+{% else %}
+<div class="card">
+<p style="color:#a0a0a0">Finished {{ report.finished }} · {{ report.rendered }} rendered · {{ report.written }} written · {{ report.skipped }} unchanged · {{ report.removed }} removed</p>
+</div>
+<div class="grid-2">
+<div class="card">
+<h2>Phases</h2>
+<table>
+{% for name, seconds in report.phases.items() %}
+<tr><td>{{ name }}{% if name == 'markdown' %} <span style="color:#a0a0a0">(part of render)</span>{% endif %}</td><td class="num">{{ '%.3f'|format(seconds) }}s</td></tr>
+{% endfor %}
+</table>
+</div>
+<div class="card">
+<h2>Counters</h2>
+<table>
+{% for name, value in report.counters.items() %}
+<tr><td>{{ name.replace('_', ' ') }}</td><td class="num">{{ value }}</td></tr>
+{% endfor %}
+</table>
+</div>
+</div>
+<div class="card">
+<h2>Slowest Pages</h2>
+<table>
+<tr><th>Page</th><th style="text-align:right">Render + write</th></tr>
+{% for path, seconds in report.slowest %}
+<tr><td>{{ path }}</td><td class="num">{{ '%.4f'|format(seconds) }}s</td></tr>
+{% endfor %}
+</table>
+</div>
+{% if report.profile %}
+<div class="card">
+<h2>Profile (cProfile, by cumulative time)</h2>
+<table>
+<tr><th>Function</th><th style="text-align:right">Calls</th><th style="text-align:right">Own</th><th style="text-align:right">Cumulative</th></tr>
+{% for function, calls, own, cumulative in report.profile %}
+<tr><td>{{ function }}</td><td class="num">{{ calls }}</td><td class="num">{{ own }}s</td><td class="num">{{ cumulative }}s</td></tr>
+{% endfor %}
+</table>
+</div>
+{% endif %}
+{% if report.memory %}
+<div class="card">
+<h2>Memory (tracemalloc, peak {{ (report.memory.peak_bytes / 1048576)|round(1) }} MB)</h2>
+<table>
+<tr><th>Allocated at</th><th style="text-align:right">Bytes held</th></tr>
+{% for location, size in report.memory.top %}
+<tr><td>{{ location }}</td><td class="num">{{ size }}</td></tr>
+{% endfor %}
+</table>
+</div>
+{% endif %}
+{% endif %}
+</div></body></html>'''
+
+# Register the admin templates once and compile them at startup, so a
+# broken template fails here instead of on a request and render_template
+# reuses the compiled form. Names end in .html to keep autoescaping on.
+ADMIN_TEMPLATES = {
+    'admin/login.html': ADMIN_LOGIN,
+    'admin/dashboard.html': ADMIN_DASHBOARD,
+    'admin/edit_expertise.html': ADMIN_EDIT_EXPERTISE,
+    'admin/edit_post.html': ADMIN_EDIT_POST,
+    'admin/metrics.html': ADMIN_METRICS
+}
+app.jinja_loader = DictLoader(ADMIN_TEMPLATES)
+for name in ADMIN_TEMPLATES:
+    app.jinja_env.get_template(name)
+
 # Routes
 @app.route('/')
 def index():
@@ -792,9 +522,9 @@ def admin_login():
             session['logged_in'] = True
             return redirect(url_for('admin_dashboard'))
         else:
-            return render_template_string(ADMIN_LOGIN, error='Invalid credentials')
+            return render_template('admin/login.html', error='Invalid credentials')
     
-    return render_template_string(ADMIN_LOGIN)
+    return render_template('admin/login.html')
 
 @app.route('/admin/logout')
 def admin_logout():
@@ -804,130 +534,158 @@ def admin_logout():
 @app.route('/admin')
 @login_required
 def admin_dashboard():
-    data = load_data()
     tab = request.args.get('tab', 'site')
     message = request.args.get('message')
     
-    posts = sorted(data['posts'], key=lambda x: x.get('date', ''), reverse=True)
+    # Each tab loads only what it shows; the blog tab gets one page of post summaries
+    context = {}
+    if tab == 'blog':
+        filters = {
+            'q': request.args.get('q', '').strip(),
+            'category': request.args.get('category', ''),
+            'status': request.args.get('status', ''),
+            'sort': request.args.get('sort', 'date'),
+            'order': 'asc' if request.args.get('order') == 'asc' else 'desc'
+        }
+        if filters['sort'] not in storage.SORTS:
+            filters['sort'] = 'date'
+        page = max(1, request.args.get('page', 1, type=int))
+        posts, total = storage.list_post_summaries(
+            offset=(page - 1) * ADMIN_PAGE_SIZE,
+            limit=ADMIN_PAGE_SIZE,
+            sort=filters['sort'],
+            descending=filters['order'] == 'desc',
+            category=filters['category'] or None,
+            published={'published': True, 'draft': False}.get(filters['status']),
+            search=filters['q'] or None
+        )
+        context.update(
+            posts=posts,
+            total=total,
+            page=page,
+            pages=max(1, -(-total // ADMIN_PAGE_SIZE)),
+            filters=filters,
+            filter_args={key: value for key, value in filters.items() if value},
+            categories=storage.post_categories(),
+            build_jobs=sitegen.BUILD_JOBS,
+            build_pool=sitegen.BUILD_POOL
+        )
+    elif tab == 'content':
+        context.update(expertise=storage.load_section('expertise'), skills=storage.load_section('skills'))
+    else:
+        site_info = storage.load_section('site_info')
+        context.update(
+            site_info=site_info,
+            posts_per_page=site_info.get('posts_per_page', sitegen.POSTS_PER_PAGE),
+            hero=storage.load_section('hero'),
+            footer=storage.load_section('footer')
+        )
     
-    return render_template_string(
-        ADMIN_DASHBOARD,
+    return render_template(
+        'admin/dashboard.html',
         tab=tab,
         message=message,
-        site_info=data['site_info'],
-        hero=data['hero'],
-        footer=data['footer'],
-        expertise=data['expertise'],
-        skills=data['skills'],
-        posts=posts
+        build=builder.snapshot(),
+        **context
     )
 
 @app.route('/admin/save-site-info', methods=['POST'])
 @login_required
 def save_site_info():
-    data = load_data()
-    data['site_info'] = {
+    site_info = storage.load_section('site_info')
+    storage.save_section('site_info', {
         'name': request.form.get('name'),
         'title': request.form.get('title'),
         'description': request.form.get('description'),
         'email': request.form.get('email'),
         'twitter': request.form.get('twitter'),
-        'domain': data['site_info'].get('domain', 'mamdhooh.com')
-    }
-    save_data(data)
-    generate_site()
+        'domain': site_info.get('domain', 'mamdhooh.com'),
+        'posts_per_page': max(0, request.form.get('posts_per_page', sitegen.POSTS_PER_PAGE, type=int))
+    })
+    builder.schedule()
     return redirect(url_for('admin_dashboard', tab='site', message='Site settings saved!'))
 
 @app.route('/admin/save-hero', methods=['POST'])
 @login_required
 def save_hero():
-    data = load_data()
-    data['hero'] = {
+    storage.save_section('hero', {
         'tag': request.form.get('tag'),
         'title': request.form.get('title'),
         'description': request.form.get('description')
-    }
-    save_data(data)
-    generate_site()
+    })
+    builder.schedule()
     return redirect(url_for('admin_dashboard', tab='site', message='Hero section saved!'))
 
 @app.route('/admin/save-footer', methods=['POST'])
 @login_required
 def save_footer():
-    data = load_data()
-    data['footer'] = {
+    storage.save_section('footer', {
         'tagline': request.form.get('tagline'),
         'text': request.form.get('text')
-    }
-    save_data(data)
-    generate_site()
+    })
+    builder.schedule()
     return redirect(url_for('admin_dashboard', tab='site', message='Footer saved!'))
 
 @app.route('/admin/save-skills', methods=['POST'])
 @login_required
 def save_skills():
-    data = load_data()
     skills_text = request.form.get('skills')
-    data['skills'] = [s.strip() for s in skills_text.split(',') if s.strip()]
-    save_data(data)
-    generate_site()
+    storage.save_section('skills', [s.strip() for s in skills_text.split(',') if s.strip()])
+    builder.schedule()
     return redirect(url_for('admin_dashboard', tab='content', message='Skills saved!'))
 
 @app.route('/admin/add-expertise', methods=['GET', 'POST'])
 @login_required
 def add_expertise():
     if request.method == 'POST':
-        data = load_data()
         new_exp = {
             'icon': request.form.get('icon'),
             'title': request.form.get('title'),
             'description': request.form.get('description')
         }
-        data['expertise'].append(new_exp)
-        save_data(data)
-        generate_site()
+        storage.update_section('expertise', lambda expertise: expertise + [new_exp])
+        builder.schedule()
         return redirect(url_for('admin_dashboard', tab='content', message='Expertise added!'))
     
-    return render_template_string(ADMIN_EDIT_EXPERTISE, expertise=None)
+    return render_template('admin/edit_expertise.html', expertise=None)
 
 @app.route('/admin/edit-expertise/<int:idx>', methods=['GET', 'POST'])
 @login_required
 def edit_expertise(idx):
-    data = load_data()
+    expertise = storage.load_section('expertise')
+    if not 0 <= idx < len(expertise):
+        return redirect(url_for('admin_dashboard', tab='content', message='Expertise not found'))
     
     if request.method == 'POST':
-        data['expertise'][idx] = {
+        updated = {
             'icon': request.form.get('icon'),
             'title': request.form.get('title'),
             'description': request.form.get('description')
         }
-        save_data(data)
-        generate_site()
+        storage.update_section('expertise', lambda expertise: expertise[:idx] + [updated] + expertise[idx + 1:])
+        builder.schedule()
         return redirect(url_for('admin_dashboard', tab='content', message='Expertise updated!'))
     
-    return render_template_string(ADMIN_EDIT_EXPERTISE, expertise=data['expertise'][idx])
+    return render_template('admin/edit_expertise.html', expertise=expertise[idx])
 
 @app.route('/admin/delete-expertise/<int:idx>')
 @login_required
 def delete_expertise(idx):
-    data = load_data()
-    data['expertise'].pop(idx)
-    save_data(data)
-    generate_site()
+    storage.update_section('expertise', lambda expertise: expertise[:idx] + expertise[idx + 1:])
+    builder.schedule()
     return redirect(url_for('admin_dashboard', tab='content', message='Expertise deleted!'))
 
 @app.route('/admin/new-post', methods=['GET', 'POST'])
 @login_required
 def new_post():
     if request.method == 'POST':
-        data = load_data()
         title = request.form.get('title')
         content = request.form.get('content')
         word_count = len(content.split())
         read_time = f"{max(1, word_count // 200)} min"
         
+        # insert_post assigns the id and makes the slug unique
         new_post = {
-            'id': max([p['id'] for p in data['posts']], default=0) + 1,
             'title': title,
             'slug': create_slug(title),
             'excerpt': request.form.get('excerpt'),
@@ -939,18 +697,16 @@ def new_post():
             'published': 'published' in request.form
         }
         
-        data['posts'].append(new_post)
-        save_data(data)
-        generate_site()
+        storage.insert_post(new_post)
+        builder.schedule()
         return redirect(url_for('admin_dashboard', tab='blog', message='Post created!'))
     
-    return render_template_string(ADMIN_EDIT_POST, post=None)
+    return render_template('admin/edit_post.html', post=None)
 
 @app.route('/admin/edit-post/<int:post_id>', methods=['GET', 'POST'])
 @login_required
 def edit_post(post_id):
-    data = load_data()
-    post = next((p for p in data['posts'] if p['id'] == post_id), None)
+    post = storage.get_post(post_id)
     
     if not post:
         return redirect(url_for('admin_dashboard', tab='blog'))
@@ -969,48 +725,107 @@ def edit_post(post_id):
         post['icon'] = request.form.get('icon')
         post['read_time'] = read_time
         post['published'] = 'published' in request.form
+        post['updated'] = datetime.now().strftime('%Y-%m-%d')
         
-        save_data(data)
-        generate_site()
+        try:
+            storage.update_post(post, expected_version=request.form.get('version', type=int))
+        except StaleEditError as e:
+            current = storage.get_post(post_id)
+            if not current:
+                return redirect(url_for('admin_dashboard', tab='blog', message='Post was deleted by someone else'))
+            # Show this editor's text again, now based on the latest version
+            post['version'] = current.get('version', 0)
+            error = f'{e}. Your changes are shown below; save again to overwrite theirs.'
+            return render_template('admin/edit_post.html', post=post, error=error), 409
+        # A renamed post's old page is removed by the build's stale-page
+        # cleanup, which runs under the build lock
+        builder.schedule()
         return redirect(url_for('admin_dashboard', tab='blog', message='Post updated!'))
     
-    return render_template_string(ADMIN_EDIT_POST, post=post)
+    return render_template('admin/edit_post.html', post=post)
 
 @app.route('/admin/delete-post/<int:post_id>')
 @login_required
 def delete_post(post_id):
-    data = load_data()
-    post = next((p for p in data['posts'] if p['id'] == post_id), None)
+    post = storage.get_post(post_id)
     
     if post:
-        html_file = os.path.join(OUTPUT_DIR, 'blog', f"{post['slug']}.html")
-        if os.path.exists(html_file):
-            os.remove(html_file)
-        
-        data['posts'] = [p for p in data['posts'] if p['id'] != post_id]
-        save_data(data)
-        generate_site()
+        storage.delete_post(post_id)
+        # The build's stale-page cleanup removes the page under the build lock
+        builder.schedule()
     
     return redirect(url_for('admin_dashboard', tab='blog', message='Post deleted!'))
 
+@app.route('/admin/import-posts', methods=['POST'])
+@login_required
+def import_posts():
+    uploads = [upload for upload in request.files.getlist('files') if upload.filename]
+    if not uploads:
+        return redirect(url_for('admin_dashboard', tab='blog', message='Choose NDJSON or Markdown files to import'))
+
+    def entries():
+        for upload in uploads:
+            if upload.filename.endswith('.md'):
+                yield upload.filename, posts_io.parse_markdown(upload.read().decode('utf-8'), upload.filename)
+            else:
+                # Uploads are spooled to disk, so the lines are read as they are imported
+                lines = (line.decode('utf-8') for line in upload.stream)
+                yield from posts_io.read_ndjson(lines, upload.filename)
+
+    try:
+        count = posts_io.import_posts(storage, entries())
+    except ValueError as e:
+        return redirect(url_for('admin_dashboard', tab='blog', message=f'Import failed, no posts were stored: {e}'))
+    if count:
+        builder.schedule()
+    return redirect(url_for('admin_dashboard', tab='blog', message=f'Imported {count} posts!'))
+
+@app.route('/admin/export-posts')
+@login_required
+def export_posts():
+    return Response(posts_io.iter_ndjson(storage.iter_posts()), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=posts.ndjson'})
+
 @app.route('/admin/regenerate')
 @login_required
 def regenerate():
-    generate_site()
-    return redirect(url_for('admin_dashboard', tab='blog', message='Site regenerated successfully!'))
+    jobs = request.args.get('jobs', type=int)
+    pool = request.args.get('pool')
+    if pool not in ('process', 'thread'):
+        pool = None
+    builder.schedule(full=True, jobs=jobs, pool=pool)
+    return redirect(url_for('admin_dashboard', tab='blog', message='Full site rebuild queued!'))
+
+@app.route('/admin/build-status')
+@login_required
+def build_status():
+    return jsonify(builder.snapshot())
+
+@app.route('/admin/metrics')
+@login_required
+def build_metrics():
+    return render_template('admin/metrics.html', report=sitegen.load_build_report(),
+                           report_file=sitegen.state_path(sitegen.BUILD_REPORT))
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Portfolio CMS')
+    parser.add_argument('--jobs', type=int, default=sitegen.BUILD_JOBS,
+                        help='workers used to render posts (0 = one per CPU)')
+    parser.add_argument('--pool', choices=('process', 'thread'), default=sitegen.BUILD_POOL,
+                        help='worker pool used when --jobs is above 1')
+    args = parser.parse_args()
+    sitegen.BUILD_JOBS = args.jobs
+    sitegen.BUILD_POOL = args.pool
+
     # Ensure footer exists in data
-    data = load_data()
-    if 'footer' not in data:
-        data['footer'] = {
+    if not storage.load_section('footer'):
+        storage.save_section('footer', {
             'text': '© 2025 Mamdhooh Moomin Rasheed. Built for speed and security.',
             'tagline': 'root@mamdhooh:~$ whoami'
-        }
-        save_data(data)
+        })
     
     # Generate initial site
-    generate_site()
+    build_site(load_data)
     
     print("""
     ╔═══════════════════════════════════════════════════════╗
@@ -0,0 +1,200 @@
+# Rendering benchmarks on synthetic archives
+# Usage: python bench.py [--sizes 100,10000,100000] [--output results.json] [--baseline baseline.json]
+#
+# Every archive size runs in its own process and temp directory, so one size
+# does not leak into the next. Peak memory is traced per benchmark with
+# tracemalloc, which slows every timing by the same factor; compare results
+# only with baselines from this script. Results are printed as JSON; with
+# --baseline, slower or hungrier benchmarks are reported and the exit code is 1.
+
+import os
+import sys
+import copy
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+CATEGORIES = ['SECURITY', 'DEVELOPMENT', 'RED TEAM', 'TOOLS', 'RESEARCH', 'DEVSECOPS']
+ICONS = ['🔒', '💻', '🎯', '🛠️', '🔍', '⚡']
+WORDS = ('exploit payload kernel socket buffer overflow token session cookie header request '
+         'response parser fuzzer scanner proxy cipher hash salt nonce audit patch deploy '
+         'container cluster pipeline secret vault policy firewall packet router sandbox').split()
+MEMORY_SLACK_KB = 256  # peak memory growth below this is never a regression
+# Posts are a mix of short notes, articles and long write-ups
+BLOCK_COUNTS = [2, 8, 30, 120]
+BLOCK_WEIGHTS = [30, 45, 20, 5]
+
+
+def words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+def markdown_block(rng):
+    """One block of Markdown using a random feature of markdown_to_html"""
+    kind = rng.random()
+    if kind < 0.45:
+        return (f"{words(rng, 12)} **{words(rng, 2)}** {words(rng, 10)} _{words(rng, 2)}_ "
+                f"{words(rng, 8)} `{rng.choice(WORDS)}()` {words(rng, 6)}.")
+    if kind < 0.6:
+        return f"{rng.choice(['#', '##', '###'])} {words(rng, 4).title()}"
+    if kind < 0.72:
+        return '\n'.join(f"- {words(rng, 6)}" for _ in range(rng.randint(2, 6)))
+    if kind < 0.8:
+        return '\n'.join(f"{n}. {words(rng, 6)}" for n in range(1, rng.randint(3, 6)))
+    if kind < 0.92:
+        lines = [f"{rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.randint(0, 99)})" for _ in range(rng.randint(3, 15))]
+        return '```python\n' + '\n'.join(lines) + '\n```'
+    return f"> {words(rng, 15)}"
+
+def synthetic_data(count, seed=0):
+    """Site data with count posts of varied size, deterministic for a seed"""
+    from storage import DEFAULT_DATA
+    from sitegen import create_slug
+
+    rng = random.Random(seed)
+    data = copy.deepcopy(DEFAULT_DATA)
+    start = time.mktime((2025, 1, 1, 0, 0, 0, 0, 0, -1))
+    for i in range(count):
+        title = f"{words(rng, 4).title()} {i + 1}"
+        blocks = rng.choices(BLOCK_COUNTS, BLOCK_WEIGHTS)[0]
+        content = '\n\n'.join(markdown_block(rng) for _ in range(blocks))
+        data['posts'].append({
+            'id': i + 1,
+            'title': title,
+            'slug': create_slug(title),
+            'excerpt': words(rng, 20),
+            'content': content,
+            'category': rng.choice(CATEGORIES),
+            'icon': rng.choice(ICONS),
+            'date': time.strftime('%Y-%m-%d', time.localtime(start - i * 3600 * 7)),
+            'read_time': f"{max(1, len(content.split()) // 200)} min",
+            'published': rng.random() < 0.95
+        })
+    return data
+
+
+def measure(results, name, func, **extra):
+    """Run func, recording its wall time and the peak Python memory it
+    allocated on top of what was already in use. Needs tracemalloc running."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    results[name] = dict(seconds=round(seconds, 4), peak_kb=(peak - before) // 1024, **extra)
+    return value
+
+def run_size(count, seed):
+    """All benchmarks for one archive size, in the current directory"""
+    import sitegen
+    from storage import open_storage
+
+    results = {}
+    data = synthetic_data(count, seed)
+    storage = open_storage()
+    measure(results, 'save_data', lambda: storage.save(data))
+    data = measure(results, 'load_data', lambda: open_storage().load())
+
+    contents = [post['content'] for post in data['posts']]
+    size = sum(len(text.encode('utf-8')) for text in contents)
+    measure(results, 'markdown', lambda: [sitegen.markdown_to_html(text) for text in contents], posts=len(contents))
+    results['markdown']['mb_per_second'] = round(size / 1e6 / max(results['markdown']['seconds'], 1e-9), 2)
+
+    for name, full in (('full_build', True), ('noop_build', False)):
+        report = measure(results, name, lambda: sitegen.generate_site(storage.load(), full=full))
+        results[name]['files_written'] = len(report['written'])
+
+    post = dict(data['posts'][len(data['posts']) // 2], published=True)
+    post['content'] += '\n\nOne more paragraph.'
+    measure(results, 'save_post', lambda: storage.update_post(post))
+    report = measure(results, 'single_post_build', lambda: sitegen.generate_site(storage.load()))
+    results['single_post_build']['files_written'] = len(report['written'])
+
+    import app
+    client = app.app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+    for tab in ('blog', 'site'):
+        response = measure(results, f'dashboard_{tab}', lambda: client.get(f'/admin?tab={tab}'))
+        results[f'dashboard_{tab}']['bytes'] = len(response.data)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lines describing benchmarks more than tolerance slower, or using more
+    than tolerance more peak memory, than the baseline"""
+    regressions = []
+    for size, benchmarks in results['sizes'].items():
+        for name, current in benchmarks.items():
+            before = baseline.get('sizes', {}).get(size, {}).get(name)
+            if not before:
+                continue
+            old, new = before['seconds'], current['seconds']
+            # Ignore jitter on very fast benchmarks
+            if new > old * (1 + tolerance) and new - old > 0.005:
+                regressions.append(f"{size} posts {name}: {old}s -> {new}s "
+                                   f"(+{(new / max(old, 1e-4) - 1) * 100:.0f}%)")
+            old, new = before.get('peak_kb'), current['peak_kb']
+            if old is not None and new > old * (1 + tolerance) and new - old > MEMORY_SLACK_KB:
+                regressions.append(f"{size} posts {name}: peak {old} KiB -> {new} KiB "
+                                   f"(+{(new / max(old, 1) - 1) * 100:.0f}%)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark site builds on synthetic archives')
+    parser.add_argument('--sizes', default='100,10000,100000',
+                        help='comma separated numbers of posts')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='also write the results to this file')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='slowdown or memory growth over the baseline reported as a regression (0.2 = 20%%)')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        tracemalloc.start()
+        json.dump(run_size(args.worker, args.seed), sys.stdout)
+        return 0
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'sizes': {}
+    }
+    for count in [int(size) for size in args.sizes.split(',')]:
+        print(f'Benchmarking {count} posts...', file=sys.stderr)
+        workdir = tempfile.mkdtemp(prefix='bench-')
+        try:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', str(count), '--seed', str(args.seed)],
+                cwd=workdir, check=True, stdout=subprocess.PIPE
+            ).stdout
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        results['sizes'][str(count)] = json.loads(output)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# Headless static site build for CI and cron jobs
+# Usage: python build.py [--data site_data.json] [--output public] [--incremental] [--jobs N] [--dry-run]
+#        python build.py --watch [--interval 1.0] [--debounce 1.0]
+#
+# Only the rendering and storage code is imported: no Flask, no .env file
+# and no server. Options such as CSS_MODE or PRECOMPRESS are still read
+# from the environment.
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import sitegen
+from storage import DATA_FILE, SQLITE_FILE, SQLITE_SUFFIXES, STORAGE_BACKEND, open_storage
+
+
+def watched_files(path):
+    """Files whose changes mean the site data changed"""
+    if path.endswith(SQLITE_SUFFIXES):
+        return [path, path + '-wal']
+    return [path, path + '.log']
+
+def file_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def wait_for_change(paths, signature, interval, debounce):
+    """Poll until the files differ from signature and then stay unchanged
+    for debounce seconds, so a burst of edits gives one rebuild. Returns the
+    new signature."""
+    current = signature
+    while current == signature:
+        time.sleep(interval)
+        current = file_signature(paths)
+    settled = time.monotonic()
+    while time.monotonic() - settled < debounce:
+        time.sleep(interval)
+        latest = file_signature(paths)
+        if latest != current:
+            current, settled = latest, time.monotonic()
+    return current
+
+def diff_data(old, new):
+    """Sections and post ids that differ between two loads of the site data"""
+    # Bookkeeping fields change on compaction without changing any page
+    ignored = ('posts', 'log_seq', 'post_id_seq')
+    sections = sorted(name for name in set(old) | set(new)
+                      if name not in ignored and old.get(name) != new.get(name))
+    old_posts = {post['id']: post for post in old.get('posts', [])}
+    new_posts = {post['id']: post for post in new.get('posts', [])}
+    return {
+        'sections': sections,
+        'added': sorted(new_posts.keys() - old_posts.keys()),
+        'changed': sorted(post_id for post_id in new_posts.keys() & old_posts.keys()
+                          if new_posts[post_id] != old_posts[post_id]),
+        'removed': sorted(old_posts.keys() - new_posts.keys()),
+        # Storage order decides the order of sitemap entries and search
+        # results (listings sort by date, so it does not affect pagination)
+        'reordered': ([post_id for post_id in old_posts if post_id in new_posts]
+                      != [post_id for post_id in new_posts if post_id in old_posts])
+    }
+
+def describe_changes(changes):
+    parts = [f"{', '.join(changes['sections'])} changed"] if changes['sections'] else []
+    for kind in ('added', 'changed', 'removed'):
+        if changes[kind]:
+            parts.append(f"{len(changes[kind])} post{'s' if len(changes[kind]) != 1 else ''} {kind}")
+    if changes['reordered']:
+        parts.append('posts reordered')
+    return ', '.join(parts)
+
+def print_report(args, report):
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif args.dry_run:
+        for path in report['rendered']:
+            print(f'render  {path}')
+        for path in report['removed']:
+            print(f'remove  {path}')
+        print(f"Dry run: {len(report['rendered'])} pages to render, {len(report['removed'])} to remove, "
+              f"{report['skipped']} up to date")
+    else:
+        print(f"Built {args.output}/ in {report['phases']['total']}s: {len(report['rendered'])} rendered, "
+              f"{len(report['written'])} written, {report['skipped']} unchanged, "
+              f"{len(report['removed'])} removed")
+        print('Phases: ' + ', '.join(f'{name} {seconds}s' for name, seconds in report['phases'].items()))
+        if report['counters'].get('minify_bytes_saved'):
+            print(f"Minified HTML: {report['counters']['minify_bytes_saved'] / 1024:.1f} KB saved")
+        for function, calls, own, cumulative in report.get('profile', [])[:10]:
+            print(f'  {cumulative:8.3f}s {calls:8d}  {function}')
+        if 'memory' in report:
+            print(f"Peak traced memory: {report['memory']['peak_bytes'] / 1048576:.1f} MB")
+
+def watch(args, storage):
+    """Rebuild incrementally whenever the data files change, until interrupted.
+
+    Polls the files' size and mtime every args.interval seconds, which costs
+    next to nothing while idle. Changes that leave the content as it was,
+    such as a compaction of the change log, do not trigger a build.
+    """
+    paths = watched_files(args.data)
+    signature = file_signature(paths)
+    data = storage.load()
+    print(f"Watching {', '.join(paths)} (Ctrl+C to stop)", flush=True)
+    while True:
+        signature = wait_for_change(paths, signature, args.interval, args.debounce)
+        # Edits made outside this process may not bump the storage version
+        storage.forget()
+        try:
+            latest = storage.load()
+        except ValueError as e:
+            # Most likely a file caught half-saved by an editor; the next save retries
+            print(f'Could not read {args.data}: {e}', file=sys.stderr, flush=True)
+            continue
+        changes = diff_data(data, latest)
+        data = latest
+        summary = describe_changes(changes)
+        if not summary:
+            continue
+        print(f'{time.strftime("%H:%M:%S")} {summary}', flush=True)
+        try:
+            report = sitegen.build_site(lambda: latest, profile=args.profile or '',
+                                        jobs=args.jobs, pool=args.pool)
+        except Exception as e:
+            print(f'Build failed: {e!r}', file=sys.stderr, flush=True)
+            continue
+        print_report(args, report)
+        sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the static site without starting the admin server')
+    parser.add_argument('--data', default=SQLITE_FILE if STORAGE_BACKEND == 'sqlite' else DATA_FILE,
+                        help='site data file (.json, or .db for SQLite)')
+    parser.add_argument('--output', default=sitegen.OUTPUT_DIR,
+                        help='directory the site is written to')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-render pages whose inputs changed since the last build')
+    parser.add_argument('--jobs', type=int, default=sitegen.BUILD_JOBS,
+                        help='workers used to render posts (0 = one per CPU)')
+    parser.add_argument('--pool', choices=('process', 'thread'), default=sitegen.BUILD_POOL,
+                        help='worker pool used when --jobs is above 1')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='list the pages that would be rendered or removed without writing anything')
+    parser.add_argument('--profile', choices=('cprofile', 'tracemalloc'), default=sitegen.BUILD_PROFILE or None,
+                        help='add a CPU or memory profile of the build to the report')
+    parser.add_argument('--minify', action='store_true', default=sitegen.MINIFY_HTML,
+                        help='strip template whitespace from HTML pages (keeps <pre> and <code> as they are)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the full build report as JSON')
+    parser.add_argument('--watch', action='store_true',
+                        help='after building, rebuild incrementally whenever the data file changes')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='seconds between checks of the data file in --watch mode')
+    parser.add_argument('--debounce', type=float, default=float(os.getenv('BUILD_DEBOUNCE', '1.0')),
+                        help='seconds the data file must stay unchanged before a rebuild')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.data):
+        parser.error(f'data file not found: {args.data}')
+    if args.watch and args.dry_run:
+        parser.error('--watch cannot be combined with --dry-run')
+    if args.interval <= 0:
+        parser.error('--interval must be positive')
+    sitegen.OUTPUT_DIR = args.output
+    sitegen.MINIFY_HTML = args.minify
+    sitegen.set_state_dir(args.data)
+    storage = open_storage(args.data)
+
+    report = sitegen.build_site(storage.load, profile=args.profile or '',
+                                full=not args.incremental, jobs=args.jobs, pool=args.pool,
+                                dry_run=args.dry_run)
+    print_report(args, report)
+
+    if args.watch:
+        sys.stdout.flush()
+        try:
+            watch(args, storage)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# Bulk post import and export as NDJSON or Markdown files with front matter
+# Usage: python posts_io.py import posts.ndjson|posts/ [--data site_data.json] [--no-build]
+#        python posts_io.py export posts.ndjson|posts/ [--data site_data.json] [--format ndjson|markdown]
+#
+# Posts are read, checked and written one at a time, and the whole import is
+# stored in a single storage transaction followed by one incremental build.
+# Like build.py this imports no Flask and reads no .env file.
+
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+
+import sitegen
+from sitegen import create_slug
+from storage import DATA_FILE, SQLITE_FILE, STORAGE_BACKEND, open_storage
+
+# Fields an imported post may set; ids, slugs and versions are assigned on import
+POST_FIELDS = ('title', 'slug', 'excerpt', 'content', 'category', 'icon', 'date',
+               'read_time', 'published', 'updated')
+TEXT_FIELDS = ('title', 'slug', 'excerpt', 'content', 'category', 'icon', 'date', 'read_time', 'updated')
+DEFAULT_CATEGORY = 'GENERAL'
+DEFAULT_ICON = '📝'
+DATE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+FRONT_MATTER_FIELD = re.compile(r'([A-Za-z_][\w-]*)\s*:\s?(.*)$')
+# Plain front matter values that would read back as something else
+NEEDS_QUOTES = re.compile(r'^$|^\s|\s$|^["\']|^(true|false|yes|no|null|~|-?\d+(\.\d+)?)$', re.IGNORECASE)
+
+
+class PostImportError(ValueError):
+    """A post that cannot be imported, with the file or line it came from"""
+
+
+def read_ndjson(f, source='<ndjson>'):
+    """Yield (where, fields) for each non-blank line of an NDJSON stream"""
+    for number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        where = f'{source}:{number}'
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            raise PostImportError(f'{where}: invalid JSON ({e})')
+        yield where, fields
+
+def parse_scalar(value):
+    value = value.strip()
+    if value.startswith('"'):
+        return json.loads(value)
+    if value.startswith("'") and value.endswith("'") and len(value) > 1:
+        return value[1:-1].replace("''", "'")
+    if value.lower() in ('true', 'yes'):
+        return True
+    if value.lower() in ('false', 'no'):
+        return False
+    return value
+
+def strip_final_newline(text):
+    """text without the newline that ends the file, as written by format_markdown"""
+    return text[:-1] if text.endswith('\n') else text
+
+def parse_markdown(text, where='<markdown>'):
+    """Fields of a Markdown post: `key: value` lines between --- markers
+    followed by the post content, kept as is apart from the final newline"""
+    text = text.lstrip('\ufeff')
+    lines = text.split('\n')
+    if lines[0].strip() != '---':
+        return {'content': strip_final_newline(text)}
+    fields = {}
+    for number, line in enumerate(lines[1:], 2):
+        if line.strip() == '---':
+            fields['content'] = strip_final_newline('\n'.join(lines[number:]))
+            return fields
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        match = FRONT_MATTER_FIELD.match(line)
+        if not match:
+            raise PostImportError(f'{where}:{number}: expected "key: value" in front matter')
+        try:
+            fields[match.group(1)] = parse_scalar(match.group(2))
+        except ValueError as e:
+            raise PostImportError(f'{where}:{number}: invalid quoted value ({e})')
+    raise PostImportError(f'{where}: front matter is not closed with ---')
+
+def read_markdown_dir(path):
+    """Yield (where, fields) for each .md file in a directory, by file name"""
+    names = sorted(entry.name for entry in os.scandir(path)
+                   if entry.is_file() and entry.name.endswith('.md'))
+    for name in names:
+        where = os.path.join(path, name)
+        with open(where, encoding='utf-8') as f:
+            yield where, parse_markdown(f.read(), where)
+
+def clean_post(where, fields, today=None):
+    """A post ready for insert_posts from imported fields, or PostImportError"""
+    if not isinstance(fields, dict):
+        raise PostImportError(f'{where}: expected an object, got {type(fields).__name__}')
+    post = {}
+    for name in TEXT_FIELDS:
+        value = fields.get(name)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise PostImportError(f'{where}: {name} must be text')
+        post[name] = str(value)
+    title = post.get('title', '').strip()
+    if not title:
+        raise PostImportError(f'{where}: title is required')
+    post['title'] = title
+    # create_slug drops hyphens, so split an existing slug into words first
+    post['slug'] = create_slug(post['slug'].replace('-', ' ') if post.get('slug') else title)
+    if not post['slug']:
+        raise PostImportError(f'{where}: cannot make a URL slug from {title!r}')
+    post.setdefault('content', '')
+    post.setdefault('excerpt', '')
+    post['category'] = post.get('category') or DEFAULT_CATEGORY
+    post['icon'] = post.get('icon') or DEFAULT_ICON
+    post['date'] = post.get('date') or today or datetime.now().strftime('%Y-%m-%d')
+    if not DATE.match(post['date']):
+        raise PostImportError(f"{where}: date must look like 2025-01-31, got {post['date']!r}")
+    if not post.get('read_time'):
+        post['read_time'] = f"{max(1, len(post['content'].split()) // 200)} min"
+    published = fields.get('published', True)
+    if not isinstance(published, bool):
+        raise PostImportError(f'{where}: published must be true or false')
+    post['published'] = published
+    return post
+
+def clean_posts(entries):
+    """clean_post over (where, fields) pairs, lazily"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    for where, fields in entries:
+        yield clean_post(where, fields, today)
+
+def import_posts(storage, entries):
+    """Store posts from (where, fields) pairs in one transaction. Raises
+    PostImportError, storing nothing, if any of them is invalid."""
+    return storage.insert_posts(clean_posts(entries))
+
+
+def export_fields(post):
+    return {name: post[name] for name in ('id',) + POST_FIELDS if name in post}
+
+def iter_ndjson(posts):
+    """NDJSON lines for posts, one at a time"""
+    for post in posts:
+        yield json.dumps(export_fields(post), ensure_ascii=False) + '\n'
+
+def format_scalar(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if NEEDS_QUOTES.search(value) or '\n' in value:
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def format_markdown(post):
+    fields = export_fields(post)
+    content = fields.pop('content', '')
+    lines = ['---'] + [f'{name}: {format_scalar(value)}' for name, value in fields.items()] + ['---', '']
+    return '\n'.join(lines) + content + '\n'
+
+def export_markdown_dir(posts, path):
+    """Write each post to <path>/<slug>.md; returns the number written"""
+    os.makedirs(path, exist_ok=True)
+    count = 0
+    for post in posts:
+        sitegen.write_file(os.path.join(path, f"{post['slug'] or post['id']}.md"), format_markdown(post))
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import or export blog posts in bulk')
+    parser.add_argument('action', choices=('import', 'export'))
+    parser.add_argument('path', help="NDJSON file ('-' for stdin/stdout) or a directory of Markdown files")
+    parser.add_argument('--data', default=SQLITE_FILE if STORAGE_BACKEND == 'sqlite' else DATA_FILE,
+                        help='site data file (.json, or .db for SQLite)')
+    parser.add_argument('--format', choices=('ndjson', 'markdown'),
+                        help='export format (default: markdown when path is a directory or ends with /)')
+    parser.add_argument('--no-build', action='store_true',
+                        help='do not rebuild the site after importing')
+    args = parser.parse_args(argv)
+    storage = open_storage(args.data)
+    sitegen.set_state_dir(args.data)
+
+    if args.action == 'export':
+        markdown = args.format == 'markdown' or (
+            args.format is None and (args.path.endswith(('/', os.sep)) or os.path.isdir(args.path)))
+        if markdown:
+            count = export_markdown_dir(storage.iter_posts(), args.path)
+            print(f'Exported {count} posts to {args.path}', file=sys.stderr)
+        elif args.path == '-':
+            sys.stdout.writelines(iter_ndjson(storage.iter_posts()))
+        else:
+            with open(args.path, 'w', encoding='utf-8') as f:
+                f.writelines(iter_ndjson(storage.iter_posts()))
+        return 0
+
+    try:
+        if args.path == '-':
+            count = import_posts(storage, read_ndjson(sys.stdin, '<stdin>'))
+        elif os.path.isdir(args.path):
+            count = import_posts(storage, read_markdown_dir(args.path))
+        else:
+            with open(args.path, encoding='utf-8') as f:
+                count = import_posts(storage, read_ndjson(f, args.path))
+    except (PostImportError, OSError) as e:
+        print(f'Import failed, no posts were stored: {e}', file=sys.stderr)
+        return 1
+    print(f'Imported {count} posts into {args.data}', file=sys.stderr)
+    if count and not args.no_build:
+        report = sitegen.build_site(storage.load)
+        print(f"Built {sitegen.OUTPUT_DIR}/ in {report['phases']['total']}s: "
+              f"{len(report['rendered'])} rendered, {len(report['written'])} written", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1443 @@
+# Static site rendering and incremental builds
+# Flask-free so that build.py starts fast; app.py and build.py share this code
+
+import os
+import re
+import json
+import time
+import heapq
+import hashlib
+import tempfile
+import gzip
+import cProfile
+import pstats
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain, repeat
+from contextlib import nullcontext
+from xml.sax.saxutils import escape, quoteattr
+
+from locking import FileLock
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configuration
+OUTPUT_DIR = 'public'
+STATE_DIR = ''  # where the build state files below live; set_state_dir() puts them next to the site data
+BUILD_MANIFEST = '.build_manifest.json'
+PRECOMPRESS = os.getenv('PRECOMPRESS', 'false').lower() in ('1', 'true', 'yes')  # write .gz/.br siblings
+MINIFY_HTML = os.getenv('MINIFY_HTML', 'false').lower() in ('1', 'true', 'yes')  # strip template whitespace from pages
+POSTS_PER_PAGE = 12  # default blog page size, editable in Site Settings
+CSS_MODE = os.getenv('CSS_MODE', 'inline')  # 'inline' or 'external' (shared fingerprinted file)
+BUILD_JOBS = int(os.getenv('BUILD_JOBS', '1'))  # 0 = one worker per CPU
+BUILD_POOL = os.getenv('BUILD_POOL', 'process')  # 'process' or 'thread'
+BUILD_BATCH_SIZE = int(os.getenv('BUILD_BATCH_SIZE', '256'))
+RENDER_CACHE = '.render_cache'  # directory of RENDER_CACHE_SHARDS json files
+RENDER_CACHE_MAX_BYTES = int(os.getenv('RENDER_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # UTF-8 bytes of HTML
+RENDER_CACHE_SHARDS = 16  # files the cache is split into, so a small rebuild rewrites only a few
+FEED_SIZE = int(os.getenv('FEED_SIZE', '20'))  # newest posts in feed.xml
+SITEMAP_LIMIT = 50000  # URLs per sitemap file allowed by the protocol
+SEARCH_CACHE = '.search_terms.json'
+SEARCH_INDEX_MAX_BYTES = int(os.getenv('SEARCH_INDEX_MAX_BYTES', str(512 * 1024)))
+SEARCH_TERMS_PER_POST = int(os.getenv('SEARCH_TERMS_PER_POST', '50'))
+SEARCH_SHARD_SIZE = int(os.getenv('SEARCH_SHARD_SIZE', '500'))  # posts per search/docs-N.json file
+SEARCH_EXCERPT_CHARS = 160  # excerpt length kept for search results
+SEARCH_PAGE = os.getenv('SEARCH_PAGE', 'false').lower() in ('1', 'true', 'yes')  # public/search.html
+BUILD_REPORT = '.build_report.json'
+BUILD_LOCK = '.build.lock'  # held while a build writes, so only one runs at a time
+BUILD_PROFILE = os.getenv('BUILD_PROFILE', '')  # '', 'cprofile' or 'tracemalloc'
+BUILD_PROFILE_FILE = '.build_profile.prof'  # cProfile stats, for pstats or snakeviz
+
+# Base CSS (minified for speed)
+BASE_CSS = '''*{margin:0;padding:0;box-sizing:border-box}:root{--bg:#0a0a0a;--card:#1a1a1a;--text:#fff;--text-dim:#a0a0a0;--accent:#00ff88;--border:#2a2a2a}body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:var(--bg);color:var(--text);line-height:1.6}
+.grid-bg{position:fixed;top:0;left:0;width:100%;height:100%;background-image:linear-gradient(var(--accent) 1px,transparent 1px),linear-gradient(90deg,var(--accent) 1px,transparent 1px);background-size:50px 50px;opacity:.03;pointer-events:none;animation:grid 20s linear infinite}
+@keyframes grid{0%{transform:translate(0,0)}100%{transform:translate(50px,50px)}}
+nav{position:fixed;top:0;width:100%;background:rgba(10,10,10,.8);backdrop-filter:blur(20px);border-bottom:1px solid var(--border);z-index:1000;padding:1.5rem 2rem}
+.nav-content{max-width:1400px;margin:0 auto;display:flex;justify-content:space-between;align-items:center}
+.logo{font-size:1.5rem;font-weight:700;color:var(--accent);letter-spacing:-.5px;text-decoration:none}
+.nav-links{display:flex;gap:2rem;list-style:none}
+.nav-links a{color:var(--text-dim);text-decoration:none;font-weight:500;transition:color .3s}
+.nav-links a:hover{color:var(--accent)}
+.container{max-width:1400px;margin:0 auto;padding:0 2rem;position:relative;z-index:1}
+.hero{min-height:100vh;display:flex;align-items:center;padding-top:80px}
+.hero-tag{display:inline-block;padding:.5rem 1rem;background:rgba(0,255,136,.1);border:1px solid var(--accent);border-radius:50px;color:var(--accent);font-size:.9rem;font-weight:600;margin-bottom:2rem}
+h1{font-size:clamp(3rem,8vw,6rem);font-weight:800;line-height:1.1;margin-bottom:1.5rem;background:linear-gradient(135deg,#fff 0%,var(--accent) 100%);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text}
+.hero-description{font-size:1.3rem;color:var(--text-dim);margin-bottom:3rem;line-height:1.8}
+.cta-buttons{display:flex;gap:1rem;flex-wrap:wrap}
+.btn{padding:1rem 2rem;border-radius:12px;text-decoration:none;font-weight:600;transition:all .3s;display:inline-flex;align-items:center;gap:.5rem}
+.btn-primary{background:var(--accent);color:var(--bg);border:2px solid var(--accent)}
+.btn-primary:hover{background:transparent;color:var(--accent);transform:translateY(-2px);box-shadow:0 10px 40px rgba(0,255,136,.3)}
+.btn-secondary{background:transparent;color:var(--text);border:2px solid var(--border)}
+.btn-secondary:hover{border-color:var(--accent);color:var(--accent);transform:translateY(-2px)}
+section{padding:8rem 0}
+.section-header{text-align:center;margin-bottom:5rem}
+.section-tag{color:var(--accent);font-weight:600;font-size:.9rem;letter-spacing:2px;text-transform:uppercase;margin-bottom:1rem}
+h2{font-size:clamp(2.5rem,5vw,4rem);font-weight:800;margin-bottom:1rem}
+.section-description{font-size:1.2rem;color:var(--text-dim);max-width:600px;margin:0 auto}
+.expertise-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(300px,1fr));gap:2rem}
+.expertise-card{background:var(--card);border:1px solid var(--border);border-radius:20px;padding:2.5rem;transition:all .3s}
+.expertise-card:hover{transform:translateY(-5px);border-color:var(--accent);box-shadow:0 20px 60px rgba(0,255,136,.1)}
+.expertise-icon{font-size:3rem;margin-bottom:1.5rem}
+.expertise-card h3{font-size:1.5rem;margin-bottom:1rem}
+.expertise-card p{color:var(--text-dim);line-height:1.8}
+.skills-container{display:flex;flex-wrap:wrap;gap:1rem;justify-content:center;max-width:900px;margin:0 auto}
+.skill-tag{padding:.8rem 1.5rem;background:var(--card);border:1px solid var(--border);border-radius:50px;font-weight:500;transition:all .3s}
+.skill-tag:hover{background:rgba(0,255,136,.1);border-color:var(--accent);color:var(--accent);transform:translateY(-2px)}
+.blog-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(350px,1fr));gap:2rem}
+.blog-card{background:var(--card);border:1px solid var(--border);border-radius:20px;overflow:hidden;transition:all .3s;text-decoration:none;color:inherit;display:block}
+.blog-card:hover{transform:translateY(-8px);border-color:var(--accent);box-shadow:0 20px 60px rgba(0,255,136,.15)}
+.blog-image{height:200px;background:linear-gradient(135deg,#1a1a1a 0%,#2a2a2a 100%);display:flex;align-items:center;justify-content:center;font-size:4rem;border-bottom:1px solid var(--border)}
+.blog-content{padding:2rem}
+.blog-meta{display:flex;gap:1rem;margin-bottom:1rem;font-size:.85rem;color:var(--text-dim)}
+.blog-tag-small{color:var(--accent);font-weight:600}
+.blog-card h3{font-size:1.4rem;margin-bottom:.8rem;line-height:1.3}
+.blog-excerpt{color:var(--text-dim);line-height:1.7;margin-bottom:1.5rem}
+.read-more{color:var(--accent);font-weight:600;display:inline-flex;align-items:center;gap:.5rem}
+.pagination{display:flex;justify-content:space-between;margin-top:3rem}
+.contact-content{max-width:700px;margin:0 auto;text-align:center}
+.contact-links{display:flex;gap:1.5rem;justify-content:center;flex-wrap:wrap;margin-top:3rem}
+.contact-link{display:flex;align-items:center;gap:.8rem;padding:1.2rem 2rem;background:var(--card);border:1px solid var(--border);border-radius:15px;color:var(--text);text-decoration:none;font-weight:600;transition:all .3s}
+.contact-link:hover{border-color:var(--accent);background:rgba(0,255,136,.05);transform:translateY(-3px);box-shadow:0 10px 40px rgba(0,255,136,.2)}
+footer{border-top:1px solid var(--border);padding:3rem 0;text-align:center;color:var(--text-dim)}
+.terminal{font-family:'Courier New',monospace;color:var(--accent);margin-bottom:1rem}
+.article{padding:10rem 0 5rem}
+.back-link{display:inline-flex;align-items:center;gap:.5rem;color:var(--text-dim);text-decoration:none;margin-bottom:3rem;transition:color .3s}
+.back-link:hover{color:var(--accent)}
+.article-icon{font-size:5rem;margin-bottom:2rem}
+.article-meta{display:flex;flex-wrap:wrap;gap:1rem;margin-bottom:2rem;font-size:.9rem;color:var(--text-dim)}
+.article-category{color:var(--accent);font-weight:600}
+.article-content{font-size:1.1rem;line-height:1.9}
+.article-content h2{font-size:2rem;margin:3rem 0 1rem;color:var(--accent)}
+.article-content h3{font-size:1.5rem;margin:2rem 0 1rem}
+.article-content p{margin:1.5rem 0;color:var(--text-dim)}
+.article-content ul,.article-content ol{margin:1.5rem 0;padding-left:2rem}
+.article-content li{margin:.5rem 0;color:var(--text-dim)}
+.article-content code{background:var(--card);padding:.2rem .5rem;border-radius:4px;color:var(--accent);font-family:'Courier New',monospace}
+.article-content pre{background:var(--card);padding:1.5rem;border-radius:8px;overflow-x:auto;margin:1.5rem 0;border:1px solid var(--border)}
+.article-content pre code{background:none;padding:0}
+.article-content blockquote{border-left:4px solid var(--accent);padding-left:1.5rem;margin:1.5rem 0;font-style:italic;color:var(--text-dim)}
+@media(max-width:768px){nav{padding:1rem}.nav-links{gap:1rem;font-size:.9rem}section{padding:4rem 0}.expertise-grid,.blog-grid{grid-template-columns:1fr}.contact-links{flex-direction:column}}'''
+
+# Content-hashed name, so the file can be cached forever
+CSS_FILE = f"assets/site.{hashlib.sha256(BASE_CSS.encode('utf-8')).hexdigest()[:12]}.css"
+
+def stylesheet(root=''):
+    """Inline <style> block, or a link to CSS_FILE when CSS_MODE is 'external'"""
+    if CSS_MODE == 'external':
+        return f'<link rel="stylesheet" href="{root}{CSS_FILE}">'
+    return f'<style>{BASE_CSS}</style>'
+
+# HTML Templates
+def generate_index_html(data):
+    # Get only the newest published post for homepage
+    published_posts = newest_first(p for p in data['posts'] if p.get('published', True))
+    featured_post = published_posts[0] if published_posts else None
+    
+    featured_blog = ''
+    if featured_post:
+        featured_blog = f'''
+        <section id="blog">
+            <div class="section-header">
+                <div class="section-tag">Latest Insight</div>
+                <h2>Featured Post</h2>
+            </div>
+            <div style="max-width:800px;margin:0 auto">
+                <a href="blog/{featured_post["slug"]}.html" class="blog-card">
+                    <div class="blog-image">{featured_post["icon"]}</div>
+                    <div class="blog-content">
+                        <div class="blog-meta">
+                            <span class="blog-tag-small">{featured_post["category"]}</span>
+                            <span>•</span>
+                            <span>{featured_post["date"]}</span>
+                            <span>•</span>
+                            <span>{featured_post["read_time"]}</span>
+                        </div>
+                        <h3>{featured_post["title"]}</h3>
+                        <p class="blog-excerpt">{featured_post["excerpt"]}</p>
+                        <span class="read-more">Read More →</span>
+                    </div>
+                </a>
+                <div style="text-align:center;margin-top:2rem">
+                    <a href="blog.html" class="btn btn-secondary">View All Posts →</a>
+                </div>
+            </div>
+        </section>'''
+    
+    expertise_cards = ''
+    for item in data['expertise']:
+        expertise_cards += f'''
+                <div class="expertise-card">
+                    <div class="expertise-icon">{item["icon"]}</div>
+                    <h3>{item["title"]}</h3>
+                    <p>{item["description"]}</p>
+                </div>'''
+    
+    skills_tags = ''.join([f'<span class="skill-tag">{skill}</span>' for skill in data['skills']])
+    
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{data["site_info"]["name"]} - {data["site_info"]["title"]}</title>
+    <meta name="description" content="{data["site_info"]["description"]}">
+    {stylesheet()}
+</head>
+<body>
+    <div class="grid-bg"></div>
+    
+    <nav>
+        <div class="nav-content">
+            <a href="index.html" class="logo">MR.</a>
+            <ul class="nav-links">
+                <li><a href="#home">Home</a></li>
+                <li><a href="#expertise">Expertise</a></li>
+                <li><a href="#skills">Skills</a></li>
+                <li><a href="blog.html">Blog</a></li>
+                <li><a href="#contact">Contact</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <div class="container">
+        <section class="hero" id="home">
+            <div class="hero-content">
+                <div class="hero-tag">{data["hero"]["tag"]}</div>
+                <h1>{data["hero"]["title"]}</h1>
+                <p class="hero-description">{data["hero"]["description"]}</p>
+                <div class="cta-buttons">
+                    <a href="#contact" class="btn btn-primary">Get in Touch<span>→</span></a>
+                    <a href="https://x.com/{data["site_info"]["twitter"][1:]}" target="_blank" class="btn btn-secondary">Follow on X</a>
+                </div>
+            </div>
+        </section>
+
+        <section id="expertise">
+            <div class="section-header">
+                <div class="section-tag">What I Do</div>
+                <h2>Expertise</h2>
+                <p class="section-description">Bridging the gap between security and development with deep technical knowledge</p>
+            </div>
+            <div class="expertise-grid">{expertise_cards}</div>
+        </section>
+
+        <section id="skills">
+            <div class="section-header">
+                <div class="section-tag">Tech Stack</div>
+                <h2>Skills & Tools</h2>
+            </div>
+            <div class="skills-container">{skills_tags}</div>
+        </section>
+
+        {featured_blog}
+
+        <section id="contact">
+            <div class="contact-content">
+                <div class="section-header">
+                    <div class="section-tag">Let's Connect</div>
+                    <h2>Get in Touch</h2>
+                    <p class="section-description">Whether it's a security consultation, collaboration opportunity, or just a chat about the latest CVE</p>
+                </div>
+                <div class="contact-links">
+                    <a href="https://x.com/{data["site_info"]["twitter"][1:]}" target="_blank" class="contact-link"><span>𝕏</span><span>{data["site_info"]["twitter"]}</span></a>
+                    <a href="mailto:{data["site_info"]["email"]}" class="contact-link"><span>✉️</span><span>{data["site_info"]["email"]}</span></a>
+                </div>
+            </div>
+        </section>
+    </div>
+
+    <footer>
+        <div class="container">
+            <p class="terminal">{data["footer"]["tagline"]}</p>
+            <p>{data["footer"]["text"]}</p>
+        </div>
+    </footer>
+</body>
+</html>'''
+
+def listing_page_path(base, page):
+    """Output path of a listing page: base.html first, then base/page/N.html"""
+    return f'{base}.html' if page == 1 else f'{base}/page/{page}.html'
+
+def blog_page_path(page):
+    """Output path of a blog listing page; page 1 is blog.html"""
+    return listing_page_path('blog', page)
+
+def category_base(slug):
+    return f'blog/category/{slug}'
+
+def paginate(items, page_size):
+    """Split items into listing pages of page_size (0 = no pagination)"""
+    if page_size <= 0:
+        return [items]
+    return [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+
+def category_slug(category):
+    return create_slug(category or '') or 'uncategorized'
+
+def newest_first(posts):
+    """Posts by date, newest first, and by id, newest first, within a day"""
+    return sorted(posts, key=lambda p: (p['date'], p.get('id', 0)), reverse=True)
+
+def category_index(posts):
+    """Map category slug -> (category name, posts in that category), keeping post order"""
+    index = {}
+    for post in posts:
+        name = post.get('category') or 'Uncategorized'
+        index.setdefault(category_slug(name), (name, []))[1].append(post)
+    return index
+
+def generate_listing_html(data, posts, base, page, has_next, title, tag, heading, description, intro, links=''):
+    """Generate one page of a post listing stored under listing_page_path(base, page);
+    description is the meta description and intro the text under the heading"""
+    root = '../' * listing_page_path(base, page).count('/')
+
+    blog_cards = ''
+    for post in posts:
+        blog_cards += f'''
+                <a href="{root}blog/{post["slug"]}.html" class="blog-card">
+                    <div class="blog-image">{post["icon"]}</div>
+                    <div class="blog-content">
+                        <div class="blog-meta">
+                            <span class="blog-tag-small">{post["category"]}</span>
+                            <span>•</span>
+                            <span>{post["date"]}</span>
+                            <span>•</span>
+                            <span>{post["read_time"]}</span>
+                        </div>
+                        <h3>{post["title"]}</h3>
+                        <p class="blog-excerpt">{post["excerpt"]}</p>
+                        <span class="read-more">Read More →</span>
+                    </div>
+                </a>'''
+
+    pagination = ''
+    if page > 1 or has_next:
+        newer = f'<a href="{root}{listing_page_path(base, page - 1)}" class="btn btn-secondary">← Newer Posts</a>' if page > 1 else '<span></span>'
+        older = f'<a href="{root}{listing_page_path(base, page + 1)}" class="btn btn-secondary">Older Posts →</a>' if has_next else ''
+        pagination = f'''
+            <div class="pagination">{newer}{older}</div>'''
+    if page > 1:
+        title = f'{title} - Page {page}'
+    
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - {data["site_info"]["name"]}</title>
+    <meta name="description" content="{description}">
+    {stylesheet(root)}
+</head>
+<body>
+    <div class="grid-bg"></div>
+    
+    <nav>
+        <div class="nav-content">
+            <a href="{root}index.html" class="logo">MR.</a>
+            <ul class="nav-links">
+                <li><a href="{root}index.html">Home</a></li>
+                <li><a href="{root}index.html#expertise">Expertise</a></li>
+                <li><a href="{root}index.html#skills">Skills</a></li>
+                <li><a href="{root}blog.html">Blog</a></li>
+                <li><a href="{root}index.html#contact">Contact</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <div class="container" style="padding-top:120px">
+        <section style="padding:4rem 0">
+            <div class="section-header">
+                <div class="section-tag">{tag}</div>
+                <h2>{heading}</h2>
+                <p class="section-description">{intro}</p>{links.format(root=root)}
+            </div>
+            <div class="blog-grid">{blog_cards}</div>{pagination}
+        </section>
+    </div>
+
+    <footer>
+        <div class="container">
+            <p class="terminal">{data["footer"]["tagline"]}</p>
+            <p>{data["footer"]["text"]}</p>
+        </div>
+    </footer>
+</body>
+</html>'''
+
+def generate_blog_page_html(data, posts=None, page=1, has_next=False):
+    """Generate one page of the blog listing (all published posts by default)"""
+    if posts is None:
+        posts = [p for p in data['posts'] if p.get('published', True)]
+    return generate_listing_html(
+        data, posts, 'blog', page, has_next,
+        title='Blog',
+        tag='Latest Insights',
+        heading='All Blog Posts',
+        description='Security insights, development tips, and penetration testing techniques',
+        intro='Thoughts on security, development, and breaking things the right way',
+        links='''
+                <div style="margin-top:2rem"><a href="{root}blog/categories/index.html" class="btn btn-secondary">Browse by Category →</a>'''
+              + (' <a href="{root}search.html" class="btn btn-secondary">Search Posts</a>' if SEARCH_PAGE else '') + '</div>'
+    )
+
+def generate_category_page_html(data, slug, name, posts, page=1, has_next=False):
+    """Generate one page of a category archive"""
+    return generate_listing_html(
+        data, posts, category_base(slug), page, has_next,
+        title=f'{name} - Blog',
+        tag='Category',
+        heading=name,
+        description=f'All posts filed under {name}',
+        intro=f'All posts filed under {name}',
+        links='''
+                <div style="margin-top:2rem"><a href="{root}blog/categories/index.html" class="btn btn-secondary">All Categories</a> <a href="{root}blog.html" class="btn btn-secondary">All Posts</a></div>'''
+    )
+
+def generate_categories_html(data, categories):
+    """Generate the category overview; categories is a list of (slug, name, post count)"""
+    category_links = ''.join(
+        f'<a href="../category/{slug}.html" class="skill-tag" style="color:inherit;text-decoration:none">{name} ({count})</a>'
+        for slug, name, count in categories
+    )
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Categories - {data["site_info"]["name"]}</title>
+    <meta name="description" content="Blog posts grouped by category">
+    {stylesheet('../../')}
+</head>
+<body>
+    <div class="grid-bg"></div>
+    
+    <nav>
+        <div class="nav-content">
+            <a href="../../index.html" class="logo">MR.</a>
+            <ul class="nav-links">
+                <li><a href="../../index.html">Home</a></li>
+                <li><a href="../../index.html#expertise">Expertise</a></li>
+                <li><a href="../../index.html#skills">Skills</a></li>
+                <li><a href="../../blog.html">Blog</a></li>
+                <li><a href="../../index.html#contact">Contact</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <div class="container" style="padding-top:120px">
+        <section style="padding:4rem 0">
+            <div class="section-header">
+                <div class="section-tag">Browse</div>
+                <h2>Categories</h2>
+                <p class="section-description">Pick a topic to see every post filed under it</p>
+            </div>
+            <div class="skills-container">{category_links}</div>
+        </section>
+    </div>
+
+    <footer>
+        <div class="container">
+            <p class="terminal">{data["footer"]["tagline"]}</p>
+            <p>{data["footer"]["text"]}</p>
+        </div>
+    </footer>
+</body>
+</html>'''
+
+def generate_search_html(data):
+    """Generate the search page; it queries search-index.json in the browser"""
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Search - {data["site_info"]["name"]}</title>
+    <meta name="description" content="Search all blog posts">
+    {stylesheet()}
+</head>
+<body>
+    <div class="grid-bg"></div>
+    
+    <nav>
+        <div class="nav-content">
+            <a href="index.html" class="logo">MR.</a>
+            <ul class="nav-links">
+                <li><a href="index.html">Home</a></li>
+                <li><a href="index.html#expertise">Expertise</a></li>
+                <li><a href="index.html#skills">Skills</a></li>
+                <li><a href="blog.html">Blog</a></li>
+                <li><a href="index.html#contact">Contact</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <div class="container" style="padding-top:120px">
+        <section style="padding:4rem 0">
+            <div class="section-header">
+                <div class="section-tag">Search</div>
+                <h2>Find a Post</h2>
+                <input id="q" type="search" placeholder="xss, recon, ci/cd..." autofocus style="width:100%;max-width:600px;margin-top:2rem;padding:1rem 1.5rem;background:var(--card);border:1px solid var(--border);border-radius:12px;color:var(--text);font-size:1.1rem">
+            </div>
+            <div class="blog-grid" id="results"></div>
+        </section>
+    </div>
+
+    <footer>
+        <div class="container">
+            <p class="terminal">{data["footer"]["tagline"]}</p>
+            <p>{data["footer"]["text"]}</p>
+        </div>
+    </footer>
+    <script>
+    var index, shards = {{}}, q = document.getElementById('q'), out = document.getElementById('results');
+    function doc(n, show) {{
+        var shard = Math.floor(n / index.shard);
+        if (!shards[shard]) shards[shard] = fetch('search/docs-' + shard + '.json').then(function (r) {{ return r.json(); }});
+        shards[shard].then(function (docs) {{ show(docs[n % index.shard]); }});
+    }}
+    function search() {{
+        var words = q.value.toLowerCase().match(/[a-z0-9]+/g) || [], hits = null;
+        out.textContent = '';
+        if (!index || !words.length) return;
+        words.forEach(function (word) {{
+            var found = {{}};
+            Object.keys(index.terms).forEach(function (term) {{
+                if (term.indexOf(word) === 0) index.terms[term].forEach(function (n) {{ found[n] = 1; }});
+            }});
+            hits = hits ? hits.filter(function (n) {{ return found[n]; }}) : Object.keys(found).map(Number);
+        }});
+        hits.slice(0, 30).forEach(function (n) {{
+            var card = document.createElement('a'), body = document.createElement('div'),
+                title = document.createElement('h3'), excerpt = document.createElement('p');
+            card.className = 'blog-card'; body.className = 'blog-content'; excerpt.className = 'blog-excerpt';
+            body.appendChild(title); body.appendChild(excerpt); card.appendChild(body); out.appendChild(card);
+            doc(n, function (d) {{ card.href = 'blog/' + d[1] + '.html'; title.textContent = d[0]; excerpt.textContent = d[2]; }});
+        }});
+    }}
+    fetch('search-index.json').then(function (r) {{ return r.json(); }}).then(function (data) {{ index = data; search(); }});
+    q.addEventListener('input', search);
+    </script>
+</body>
+</html>'''
+
+def generate_post_html(post, site_info, footer, content_html=None):
+    if content_html is None:
+        content_html = render_markdown(post['content'])
+    
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{post["title"]} - {site_info["name"]}</title>
+    <meta name="description" content="{post["excerpt"]}">
+    {stylesheet('../')}
+</head>
+<body>
+    <div class="grid-bg"></div>
+    
+    <nav>
+        <div class="nav-content">
+            <a href="../index.html" class="logo">MR.</a>
+            <ul class="nav-links">
+                <li><a href="../index.html">Home</a></li>
+                <li><a href="../index.html#blog">Blog</a></li>
+                <li><a href="../index.html#contact">Contact</a></li>
+            </ul>
+        </div>
+    </nav>
+
+    <div class="container">
+        <article class="article">
+            <a href="../index.html#blog" class="back-link">← Back to Blog</a>
+            <div class="article-icon">{post["icon"]}</div>
+            <div class="article-meta">
+                <a href="category/{category_slug(post["category"])}.html" class="article-category" style="text-decoration:none">{post["category"]}</a>
+                <span>•</span>
+                <span>{post["date"]}</span>
+                <span>•</span>
+                <span>{post["read_time"]}</span>
+            </div>
+            <h1>{post["title"]}</h1>
+            <div class="article-content">{content_html}</div>
+        </article>
+    </div>
+
+    <footer>
+        <div class="container">
+            <p>© 2025 {site_info["name"]}</p>
+        </div>
+    </footer>
+</body>
+</html>'''
+
+# Feeds and sitemaps, written as a stream of chunks rather than whole documents
+def site_url(site_info):
+    """Absolute base URL of the public site, with a trailing slash"""
+    domain = site_info.get('domain', '').rstrip('/')
+    if not domain.startswith(('http://', 'https://')):
+        domain = f'https://{domain}'
+    return domain + '/'
+
+def post_lastmod(post):
+    return post.get('updated') or post['date']
+
+def generate_feed_xml(site_info, posts):
+    """Yield an Atom feed of posts (newest first) chunk by chunk"""
+    base = site_url(site_info)
+    updated = max((post_lastmod(p) for p in posts), default=datetime.now().strftime('%Y-%m-%d'))
+    yield f'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>{escape(site_info["name"])}</title>
+<subtitle>{escape(site_info["description"])}</subtitle>
+<link href={quoteattr(base + "feed.xml")} rel="self"/>
+<link href={quoteattr(base)}/>
+<id>{escape(base)}</id>
+<updated>{updated}T00:00:00Z</updated>
+<author><name>{escape(site_info["name"])}</name></author>
+'''
+    for post in posts:
+        url = f"{base}blog/{post['slug']}.html"
+        yield f'''<entry>
+<title>{escape(post["title"])}</title>
+<link href={quoteattr(url)}/>
+<id>{escape(url)}</id>
+<published>{post["date"]}T00:00:00Z</published>
+<updated>{post_lastmod(post)}T00:00:00Z</updated>
+<category term={quoteattr(post["category"])}/>
+<summary>{escape(post["excerpt"])}</summary>
+</entry>
+'''
+    yield '</feed>\n'
+
+def generate_sitemap_xml(base, urls):
+    """Yield a sitemap <urlset> for (path, lastmod) pairs chunk by chunk"""
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, lastmod in urls:
+        loc = base if path == 'index.html' else base + path
+        lastmod = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+        yield f'<url><loc>{escape(loc)}</loc>{lastmod}</url>\n'
+    yield '</urlset>\n'
+
+def generate_sitemap_index_xml(base, sitemaps):
+    """Yield a sitemap index for (path, lastmod) pairs of sitemap files"""
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path, lastmod in sitemaps:
+        lastmod = f'<lastmod>{lastmod}</lastmod>' if lastmod else ''
+        yield f'<sitemap><loc>{escape(base + path)}</loc>{lastmod}</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+# Inline markers; the capture group keeps them in re.split output
+INLINE_MARKER = re.compile(r'(\*\*|_|`)')
+INLINE_TAGS = {'**': 'strong', '_': 'em', '`': 'code'}
+
+def format_inline(line):
+    """Apply bold, italic and inline code formatting in a single scan.
+
+    Markers pair up left to right. An unmatched trailing ** still opens a
+    <strong> tag while an unmatched _ or ` is kept as text.
+    """
+    parts = INLINE_MARKER.split(line)
+    if len(parts) == 1:
+        return line
+    markers = parts[1::2]
+    # How many of each marker get turned into tags
+    limits = {'**': markers.count('**')}
+    for marker in ('_', '`'):
+        count = markers.count(marker)
+        limits[marker] = count - count % 2
+    seen = {'**': 0, '_': 0, '`': 0}
+    out = [parts[0]]
+    for i in range(1, len(parts), 2):
+        marker = parts[i]
+        n = seen[marker]
+        if n < limits[marker]:
+            out.append(f"<{'/' if n % 2 else ''}{INLINE_TAGS[marker]}>")
+        else:
+            out.append(marker)
+        seen[marker] = n + 1
+        out.append(parts[i + 1])
+    return ''.join(out)
+
+def markdown_to_html(text):
+    """Simple markdown to HTML converter"""
+    html = []
+    in_code_block = False
+    code_block = []
+    list_type = None
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+
+        # Code blocks
+        if stripped.startswith('```'):
+            if in_code_block:
+                html.append(f"<pre><code>{''.join(code_block).strip()}</code></pre>")
+                code_block = []
+                in_code_block = False
+            else:
+                in_code_block = True
+            continue
+
+        if in_code_block:
+            code_block.append(line + '\n')
+            continue
+
+        # Lists stay open across list items only
+        if list_type and not (stripped.startswith(('- ', '* ')) or
+                              (stripped[:1].isdigit() and '. ' in line)):
+            html.append(f'</{list_type}>')
+            list_type = None
+
+        # Headers
+        if line.startswith('# '):
+            html.append(f'<h2>{line[2:]}</h2>')
+        elif line.startswith('## '):
+            html.append(f'<h2>{line[3:]}</h2>')
+        elif line.startswith('### '):
+            html.append(f'<h3>{line[4:]}</h3>')
+        # Lists
+        elif stripped.startswith(('- ', '* ')):
+            if not list_type:
+                html.append('<ul>')
+                list_type = 'ul'
+            html.append(f'<li>{stripped[2:]}</li>')
+        elif stripped[:1].isdigit() and '. ' in line:
+            if not list_type:
+                html.append('<ol>')
+                list_type = 'ol'
+            html.append(f'<li>{stripped.split(".", 1)[1].strip()}</li>')
+        # Blockquote
+        elif stripped.startswith('>'):
+            html.append(f'<blockquote>{stripped[1:].strip()}</blockquote>')
+        # Paragraph
+        elif stripped:
+            html.append(f'<p>{format_inline(line)}</p>')
+
+    if list_type:
+        html.append(f'</{list_type}>')
+
+    return ''.join(html)
+
+# Render cache: Markdown bodies keyed by content hash, persisted between builds.
+# Entries are spread over RENDER_CACHE_SHARDS files by the first hex digit of
+# their key; each shard is loaded on first use, keeps its own share of
+# RENDER_CACHE_MAX_BYTES in least- to most-recently-used order, and is only
+# rewritten when an entry was added or evicted.
+MARKDOWN_VERSION = 1  # Bump whenever markdown_to_html output changes
+_render_cache = {}  # shard number -> OrderedDict of key -> html
+_render_cache_size = {}  # shard number -> UTF-8 bytes of its html
+_render_cache_dirty = set()  # shard numbers changed since they were saved
+
+def render_cache_key(text):
+    return hashlib.sha1(f'{MARKDOWN_VERSION}:{text}'.encode('utf-8')).hexdigest()
+
+def render_cache_path(shard):
+    return os.path.join(state_path(RENDER_CACHE), f'{shard:x}.json')
+
+def load_render_cache(key):
+    """The in-memory shard holding key, read from RENDER_CACHE on first use"""
+    shard = int(key[0], 16) % RENDER_CACHE_SHARDS
+    cache = _render_cache.get(shard)
+    if cache is None:
+        cache = _render_cache[shard] = OrderedDict()
+        try:
+            with open(render_cache_path(shard), 'r', encoding='utf-8') as f:
+                cache.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        _render_cache_size[shard] = sum(len(html.encode('utf-8')) for html in cache.values())
+    return shard, cache
+
+def save_render_cache():
+    """Persist the shards that gained or lost entries during this build"""
+    for shard in sorted(_render_cache_dirty):
+        write_file(render_cache_path(shard), json.dumps(_render_cache[shard], ensure_ascii=False))
+    _render_cache_dirty.clear()
+
+def render_cache_get(text):
+    """Cached HTML for a Markdown body, or None"""
+    key = render_cache_key(text)
+    _, cache = load_render_cache(key)
+    html = cache.get(key)
+    metrics.count('render_cache_misses' if html is None else 'render_cache_hits')
+    if html is not None:
+        # Recency is saved along with the next change to this shard
+        cache.move_to_end(key)
+    return html
+
+def render_cache_put(text, html):
+    """Store a rendered body, evicting least recently used entries over the shard's size cap"""
+    key = render_cache_key(text)
+    shard, cache = load_render_cache(key)
+    if key in cache:
+        cache.move_to_end(key)
+        return
+    cache[key] = html
+    _render_cache_size[shard] += len(html.encode('utf-8'))
+    while _render_cache_size[shard] > RENDER_CACHE_MAX_BYTES // RENDER_CACHE_SHARDS and len(cache) > 1:
+        _, evicted = cache.popitem(last=False)
+        _render_cache_size[shard] -= len(evicted.encode('utf-8'))
+    _render_cache_dirty.add(shard)
+
+def render_markdown(text):
+    """markdown_to_html backed by the render cache"""
+    html = render_cache_get(text)
+    if html is None:
+        started = time.perf_counter()
+        html = markdown_to_html(text)
+        metrics.add_phase('markdown', time.perf_counter() - started)
+        render_cache_put(text, html)
+    return html
+
+def render_post_page(post, site_info, footer, content_html=None):
+    """Render a post page in a worker. Converts the body when the cache
+    had no entry for it and returns (page_html, content_html, seconds spent
+    on Markdown, seconds in total)."""
+    started = time.perf_counter()
+    if content_html is None:
+        content_html = markdown_to_html(post['content'])
+    markdown_seconds = time.perf_counter() - started
+    page = generate_post_html(post, site_info, footer, content_html)
+    return page, content_html, markdown_seconds, time.perf_counter() - started
+
+def create_slug(title):
+    """Create URL-friendly slug from title"""
+    slug = title.lower()
+    slug = ''.join(c if c.isalnum() or c.isspace() else '' for c in slug)
+    slug = '-'.join(slug.split())
+    return slug
+
+# Search index: per-post terms are cached by content, the index is rebuilt from them
+SEARCH_WORD = re.compile(r'[a-z0-9]+')
+SEARCH_STOPWORDS = frozenset(
+    'an and are as at be but by can do for from has have how if in into is it its my not of on or '
+    'so that the their then there these this to was we what when which will with you your'.split()
+)
+_search_terms = None
+_search_terms_used = {}
+
+def search_terms(post):
+    """The SEARCH_TERMS_PER_POST most significant words of a post; title and
+    excerpt words count more than body words"""
+    weights = {}
+    for text, weight in ((post['title'], 3), (post['excerpt'], 2), (post['content'], 1)):
+        for word in SEARCH_WORD.findall(text.lower()):
+            if len(word) > 1 and word not in SEARCH_STOPWORDS:
+                weights[word] = weights.get(word, 0) + weight
+    ranked = sorted(weights, key=lambda word: (-weights[word], word))
+    return sorted(ranked[:SEARCH_TERMS_PER_POST])
+
+def cached_search_terms(post):
+    """search_terms() backed by SEARCH_CACHE, so only changed posts are re-tokenized"""
+    global _search_terms
+    if _search_terms is None:
+        try:
+            with open(state_path(SEARCH_CACHE), 'r', encoding='utf-8') as f:
+                _search_terms = json.load(f)
+        except (OSError, ValueError):
+            _search_terms = {}
+    key = input_hash(post['title'], post['excerpt'], post['content'], SEARCH_TERMS_PER_POST)
+    terms = _search_terms.get(key)
+    metrics.count('search_cache_misses' if terms is None else 'search_cache_hits')
+    if terms is None:
+        terms = search_terms(post)
+    _search_terms_used[key] = terms
+    return terms
+
+def save_search_cache():
+    """Persist the terms of the posts seen in this build, dropping the rest"""
+    global _search_terms, _search_terms_used
+    if not _search_terms_used:
+        return
+    write_file(state_path(SEARCH_CACHE), json.dumps(_search_terms_used, ensure_ascii=False, sort_keys=True))
+    _search_terms, _search_terms_used = _search_terms_used, {}
+
+def search_doc_shards(posts):
+    """[title, slug, shortened excerpt] of each post, split into lists of
+    SEARCH_SHARD_SIZE; shard N is published as search/docs-N.json"""
+    docs = []
+    for post in posts:
+        excerpt = post['excerpt']
+        if len(excerpt) > SEARCH_EXCERPT_CHARS:
+            excerpt = excerpt[:SEARCH_EXCERPT_CHARS].rsplit(' ', 1)[0] + '…'
+        docs.append([post['title'], post['slug'], excerpt])
+    return paginate(docs, max(1, SEARCH_SHARD_SIZE))
+
+def build_search_index(posts):
+    """Serialize a compact inverted index of posts.
+
+    'terms' maps each term to the positions of the posts that contain it.
+    The titles, slugs and excerpts the results show are not part of it:
+    post N is entry N % shard of search/docs-<N // shard>.json, which the
+    search page fetches only for the hits it displays. When the index would
+    exceed SEARCH_INDEX_MAX_BYTES the most common (least selective) terms
+    are dropped first.
+    """
+    postings = {}
+    for number, post in enumerate(posts):
+        for term in cached_search_terms(post):
+            postings.setdefault(term, []).append(number)
+
+    def entry_size(term):
+        return len(term.encode('utf-8')) + len(json.dumps(postings[term], separators=(',', ':'))) + 4
+
+    size = len(f'{{"count":{len(posts)},"shard":{SEARCH_SHARD_SIZE},"terms":{{}}}}')
+    size += sum(entry_size(term) for term in postings)
+    for term in sorted(postings, key=lambda term: (-len(postings[term]), term)):
+        if size <= SEARCH_INDEX_MAX_BYTES:
+            break
+        size -= entry_size(term)
+        del postings[term]
+
+    return json.dumps({'count': len(posts), 'shard': max(1, SEARCH_SHARD_SIZE), 'terms': postings},
+                      ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+# File output
+def write_file(path, content):
+    """Write content to path unless the file already holds the same bytes.
+
+    Changed files are written to a temp file in the same directory and
+    moved into place with os.replace, so readers never see a partial page.
+    Returns True when the file was written.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    return replace_file(path, lambda f: f.write(data))
+
+def write_stream(path, chunks):
+    """Like write_file, for text produced chunk by chunk.
+
+    The chunks go straight to a temp file while being hashed; if the
+    result matches the file on disk the temp file is discarded.
+    """
+    digest = hashlib.sha1()
+
+    def write(f):
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            digest.update(data)
+            f.write(data)
+
+    return replace_file(path, write, lambda: file_hash(path) == digest.hexdigest())
+
+def file_hash(path):
+    """SHA-1 of a file read in blocks, or None if it does not exist"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def replace_file(path, write, unchanged=None):
+    """Fill a temp file next to path with write(f) and move it into place,
+    keeping the old file's permissions. If unchanged() is given and returns
+    True afterwards, the temp file is dropped instead. Returns True when
+    path was replaced."""
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        if unchanged and unchanged():
+            os.remove(tmp_path)
+            return False
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+def compressed_suffixes():
+    """Suffixes of the siblings write_compressed keeps next to each page"""
+    if not PRECOMPRESS:
+        return ()
+    return COMPRESSED_SUFFIXES if brotli else ('.gz',)
+
+def compressed_siblings_match(path):
+    """True when path has exactly the compressed siblings it should have"""
+    expected = compressed_suffixes()
+    return all(os.path.exists(path + suffix) == (suffix in expected) for suffix in COMPRESSED_SUFFIXES)
+
+def write_compressed(path, data):
+    """Bring the .gz/.br siblings of path in line with its bytes.
+
+    With PRECOMPRESS on they are written at maximum compression (.br only
+    when the brotli module is installed); otherwise any old siblings are
+    removed so the web server never serves a stale copy.
+    """
+    compressors = {
+        '.gz': lambda: gzip.compress(data, compresslevel=9, mtime=0),
+        '.br': lambda: brotli.compress(data, quality=11)
+    }
+    expected = compressed_suffixes()
+    for suffix in COMPRESSED_SUFFIXES:
+        if suffix in expected:
+            write_file(path + suffix, compressors[suffix]())
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+# HTML minification: elements whose content is left exactly as rendered
+MINIFY_PROTECTED = re.compile(r'<(pre|code|textarea|script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+MINIFY_NEWLINE = re.compile(r'\n\s*')
+# Whitespace next to these tags is never rendered, so it can go entirely
+MINIFY_BLOCK_TAG = re.compile(
+    r'<(?:!|/?(?:html|head|body|meta|link|title|div|p|h[1-6]|ul|ol|li|nav|header|footer|section|'
+    r'article|main|aside|form|table|thead|tbody|tr|td|th|br|hr|blockquote|pre|script|style)\b)', re.IGNORECASE)
+
+def minify_text(html):
+    """Collapse the line breaks and indentation in markup without protected elements"""
+    def replace(match):
+        start, end = match.span()
+        next_open = html.find('<', end)
+        next_close = html.find('>', end)
+        if next_close != -1 and (next_open == -1 or next_close < next_open):
+            return match.group()  # inside a tag, e.g. in an attribute value
+        if next_open == end and MINIFY_BLOCK_TAG.match(html, end):
+            return ''
+        if start and html[start - 1] == '>' and MINIFY_BLOCK_TAG.match(html, html.rfind('<', 0, start)):
+            return ''
+        return ' '
+    return MINIFY_NEWLINE.sub(replace, html)
+
+def minify_html(html):
+    """Remove the template indentation and newlines from a page.
+
+    Line breaks with the whitespace around them become a single space, or
+    nothing next to block level tags where they could never show. Tags and
+    <pre>, <code>, <textarea>, <script> and <style> elements are copied
+    unchanged. The same input always gives the same output.
+    """
+    out = []
+    position = 0
+    for match in MINIFY_PROTECTED.finditer(html):
+        out.append(minify_text(html[position:match.start()]))
+        out.append(match.group())
+        position = match.end()
+    out.append(minify_text(html[position:]))
+    # Spaces left next to protected block elements go like those next to other block tags
+    for i in range(1, len(out), 2):
+        if MINIFY_BLOCK_TAG.match(out[i]):
+            out[i - 1] = out[i - 1].rstrip(' ')
+            out[i + 1] = out[i + 1].lstrip(' ')
+    return ''.join(out).strip()
+
+# Build metrics
+class BuildMetrics:
+    """Phase timings, per-page timings and counters of the current build"""
+
+    COUNTERS = ('pages_rendered', 'files_written', 'bytes_written', 'minify_bytes_saved', 'render_cache_hits',
+                'render_cache_misses', 'search_cache_hits', 'search_cache_misses')
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self.pages = []
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0) + seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def page(self, path, seconds):
+        self.pages.append((path, seconds))
+
+    def summary(self, slowest=10):
+        return {
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'counters': dict(self.counters),
+            'slowest': [[path, round(seconds, 4)]
+                        for path, seconds in heapq.nlargest(slowest, self.pages, key=lambda page: page[1])]
+        }
+
+metrics = BuildMetrics()
+
+def profile_summary(profiler, limit=25):
+    """Functions with the highest cumulative time as [function, calls, own seconds, cumulative seconds]"""
+    profiler.dump_stats(state_path(BUILD_PROFILE_FILE))
+    stats = pstats.Stats(profiler).stats
+    top = heapq.nlargest(limit, stats.items(), key=lambda item: item[1][3])
+    return [[f"{os.path.basename(filename)}:{line}({function})", calls, round(own, 4), round(cumulative, 4)]
+            for (filename, line, function), (_, calls, own, cumulative, _) in top]
+
+def memory_summary(limit=15):
+    """Peak traced memory and the source lines holding the most memory at the end of the build"""
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    top = snapshot.statistics('lineno')[:limit]
+    return {
+        'peak_bytes': peak,
+        'top': [[f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size]
+                for stat in top]
+    }
+
+def load_build_report():
+    """The report saved by the last build, or None"""
+    try:
+        with open(state_path(BUILD_REPORT), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_build_report(report):
+    summary = dict(report)
+    for key in ('rendered', 'written', 'removed'):
+        summary[key] = len(report[key])
+    summary['finished'] = datetime.now().isoformat(timespec='seconds')
+    write_file(state_path(BUILD_REPORT), json.dumps(summary, indent=2, ensure_ascii=False))
+
+def remove_page(path):
+    """Delete a generated page and its compressed siblings. Returns True if the page existed."""
+    target = os.path.join(OUTPUT_DIR, path)
+    for sibling in [target + suffix for suffix in COMPRESSED_SUFFIXES]:
+        if os.path.exists(sibling):
+            os.remove(sibling)
+    if os.path.exists(target):
+        os.remove(target)
+        return True
+    return False
+
+# Build state: manifest, caches, report and lock
+def set_state_dir(data_path):
+    """Keep the build state files in the directory of the site data file,
+    so builds agree on them whatever directory they are started from"""
+    global STATE_DIR
+    STATE_DIR = os.path.dirname(os.path.abspath(data_path))
+
+def state_path(name):
+    return os.path.join(STATE_DIR, name)
+
+# Incremental builds
+def load_manifest():
+    """Load the page -> input hash map recorded by the previous build"""
+    try:
+        with open(state_path(BUILD_MANIFEST), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    write_file(state_path(BUILD_MANIFEST), json.dumps(manifest, indent=2, sort_keys=True))
+
+def input_hash(*inputs):
+    """Stable hash of the data a page is rendered from"""
+    blob = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+
+def template_hash():
+    """Hash of the generator source, output directory and options, so
+    template, CSS or option changes dirty every page"""
+    with open(__file__, 'rb') as f:
+        return input_hash(hashlib.sha1(f.read()).hexdigest(), os.path.abspath(OUTPUT_DIR),
+                          CSS_MODE, PRECOMPRESS, bool(brotli), SEARCH_PAGE, MINIFY_HTML)
+
+def post_card(post):
+    """Fields of a post shown on listing pages"""
+    return {key: post[key] for key in ('slug', 'icon', 'category', 'date', 'read_time', 'title', 'excerpt')}
+
+def plan_pages(data):
+    """Map every output page to the hash of its inputs.
+
+    index.html depends on the site sections and the featured post card,
+    each blog or category listing page on the cards it shows and each post
+    page on the post itself plus the site name. Returns the listing pages with a
+    render callable and the post pages with their post, so posts can be
+    rendered in a worker pool.
+    """
+    published = [p for p in data['posts'] if p.get('published', True)]
+    # Listings run newest first, matching their Newer/Older links. The
+    # sitemap and search shards keep storage order, so a new post only
+    # changes their last file.
+    listed = newest_first(published)
+    cards = [post_card(p) for p in listed]
+    site_info = data['site_info']
+    pages = {
+        'index.html': (
+            input_hash(site_info, data['hero'], data['footer'], data['expertise'], data['skills'], cards[:1]),
+            lambda: generate_index_html(data)
+        )
+    }
+    # Listing pages only depend on their own slice of cards, so an edit
+    # re-renders just the page(s) the post appears on
+    page_size = int(site_info.get('posts_per_page', POSTS_PER_PAGE))
+    listing = list(zip(paginate(listed, page_size), paginate(cards, page_size)))
+    listing_lastmods = {}
+    for number, (chunk, chunk_cards) in enumerate(listing, 1):
+        has_next = number < len(listing)
+        listing_lastmods[blog_page_path(number)] = max((post_lastmod(p) for p in chunk), default=None)
+        pages[blog_page_path(number)] = (
+            input_hash(site_info['name'], data['footer'], chunk_cards, number, has_next),
+            lambda chunk=chunk, number=number, has_next=has_next: generate_blog_page_html(data, chunk, number, has_next)
+        )
+
+    # Category archives, from a category -> posts index built once per build
+    categories = category_index(listed)
+    overview = sorted((slug, name, len(items)) for slug, (name, items) in categories.items())
+    # In a directory of its own, so no post slug or category slug can claim its path
+    pages['blog/categories/index.html'] = (
+        input_hash(site_info['name'], data['footer'], overview),
+        lambda: generate_categories_html(data, overview)
+    )
+    for slug, (name, items) in categories.items():
+        archive = paginate(items, page_size)
+        for number, chunk in enumerate(archive, 1):
+            has_next = number < len(archive)
+            listing_lastmods[listing_page_path(category_base(slug), number)] = max(post_lastmod(p) for p in chunk)
+            pages[listing_page_path(category_base(slug), number)] = (
+                input_hash(site_info['name'], data['footer'], name, [post_card(p) for p in chunk], number, has_next),
+                lambda slug=slug, name=name, chunk=chunk, number=number, has_next=has_next:
+                    generate_category_page_html(data, slug, name, chunk, number, has_next)
+            )
+
+    # Client-side search
+    search_index = build_search_index(published)
+    pages['search-index.json'] = (input_hash(search_index), lambda: search_index)
+    for number, shard in enumerate(search_doc_shards(published)):
+        pages[f'search/docs-{number}.json'] = (
+            input_hash(shard),
+            lambda shard=shard: json.dumps(shard, ensure_ascii=False, separators=(',', ':'))
+        )
+    if SEARCH_PAGE:
+        pages['search.html'] = (input_hash(site_info['name'], data['footer']), lambda: generate_search_html(data))
+
+    if CSS_MODE == 'external':
+        pages[CSS_FILE] = (input_hash(BASE_CSS), lambda: BASE_CSS)
+    posts = {}
+    for post in published:
+        posts[f"blog/{post['slug']}.html"] = (input_hash(post, site_info['name']), post)
+
+    # Atom feed of the newest posts
+    newest = newest_first(published)[:FEED_SIZE]
+    feed_inputs = [(post_card(p), post_lastmod(p)) for p in newest]
+    pages['feed.xml'] = (
+        input_hash(site_info, feed_inputs),
+        lambda: generate_feed_xml(site_info, newest)
+    )
+
+    # Sitemap. Posts come before the listing pages, whose number grows,
+    # so adding a post only changes the last sitemap file
+    site_lastmod = max((post_lastmod(p) for p in published), default=None)
+    urls = [('index.html', site_lastmod)]
+    urls += [(path, post_lastmod(post)) for path, (digest, post) in posts.items()]
+    for path in pages:
+        if path.endswith('.html') and path != 'index.html':
+            urls.append((path, listing_lastmods.get(path, site_lastmod)))
+    base = site_url(site_info)
+    sitemaps = paginate(urls, SITEMAP_LIMIT)
+    if len(sitemaps) == 1:
+        pages['sitemap.xml'] = (input_hash(base, urls), lambda: generate_sitemap_xml(base, urls))
+    else:
+        index = []
+        for number, chunk in enumerate(sitemaps, 1):
+            path = f'sitemap-{number}.xml'
+            index.append((path, max((lastmod for _, lastmod in chunk if lastmod), default=None)))
+            pages[path] = (input_hash(base, chunk), lambda chunk=chunk: generate_sitemap_xml(base, chunk))
+        pages['sitemap.xml'] = (input_hash(base, index), lambda: generate_sitemap_index_xml(base, index))
+    return pages, posts
+
+def render_pages(todo):
+    """Yield (path, html, seconds) for each (path, render) in todo"""
+    for path, render in todo:
+        started = time.perf_counter()
+        html = render()
+        yield path, html, time.perf_counter() - started
+
+def render_posts(todo, site_info, footer, jobs=1, pool='process'):
+    """Yield (path, html, seconds) for each (path, post) in todo.
+
+    With jobs > 1 posts are fanned out to a process or thread pool in
+    batches of BUILD_BATCH_SIZE, so each batch is written before the next
+    one is queued. Output is identical to the serial path. The render
+    cache is only touched from the calling thread: cached bodies are sent
+    along with their post and fresh ones are stored as results come back.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) < 2:
+        for path, post in todo:
+            started = time.perf_counter()
+            html = generate_post_html(post, site_info, footer)
+            yield path, html, time.perf_counter() - started
+        return
+
+    executor_class = ThreadPoolExecutor if pool == 'thread' else ProcessPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        for start in range(0, len(todo), BUILD_BATCH_SIZE):
+            batch = todo[start:start + BUILD_BATCH_SIZE]
+            posts = [post for _, post in batch]
+            chunksize = max(1, len(batch) // (jobs * 4))
+            results = executor.map(
+                render_post_page,
+                posts, repeat(site_info), repeat(footer),
+                [render_cache_get(post['content']) for post in posts],
+                chunksize=chunksize
+            )
+            for (path, post), (html, content_html, markdown_seconds, seconds) in zip(batch, results):
+                render_cache_put(post['content'], content_html)
+                metrics.add_phase('markdown', markdown_seconds)
+                yield path, html, seconds
+
+def generate_site(data, full=False, jobs=None, pool=None, dry_run=False):
+    """Generate the static HTML files whose inputs changed since the last build.
+
+    Pass full=True to re-render every page regardless of the manifest.
+    jobs and pool default to BUILD_JOBS and BUILD_POOL.
+    With MINIFY_HTML on, HTML pages go through minify_html() before they
+    are written.
+    Returns a report listing the pages rendered, the files actually written
+    and the stale pages removed, plus the number of files left untouched,
+    phase timings (markdown is part of render), counters and the slowest
+    pages. With dry_run=True nothing is rendered or written: 'rendered' and
+    'removed' list what a real build would render and remove.
+    """
+    global metrics
+    metrics = BuildMetrics()
+    started = time.perf_counter()
+    previous = load_manifest()
+    templates = template_hash()
+    if full or previous.get('__templates__') != templates:
+        dirty = {}
+    else:
+        dirty = previous
+
+    def is_dirty(path, digest):
+        return dirty.get(path) != digest or not os.path.exists(os.path.join(OUTPUT_DIR, path))
+
+    pages, posts = plan_pages(data)
+    manifest = {'__templates__': templates}
+    manifest.update((path, digest) for path, (digest, _) in pages.items())
+    manifest.update((path, digest) for path, (digest, _) in posts.items())
+    metrics.add_phase('plan', time.perf_counter() - started)
+
+    if dry_run:
+        rendered = [path for path, (digest, _) in chain(pages.items(), posts.items()) if is_dirty(path, digest)]
+        removed = [path for path in sorted(set(previous) - set(manifest))
+                   if os.path.exists(os.path.join(OUTPUT_DIR, path))]
+        return {'rendered': rendered, 'written': [], 'skipped': len(pages) + len(posts) - len(rendered),
+                'removed': removed, **metrics.summary()}
+
+    page_html = render_pages([(path, render) for path, (digest, render) in pages.items() if is_dirty(path, digest)])
+    post_html = render_posts(
+        [(path, post) for path, (digest, post) in posts.items() if is_dirty(path, digest)],
+        data['site_info'], data['footer'],
+        jobs=BUILD_JOBS if jobs is None else jobs,
+        pool=pool or BUILD_POOL
+    )
+
+    report = {'rendered': [], 'written': [], 'skipped': 0, 'removed': []}
+    rendering = time.perf_counter()
+    write_seconds = minify_seconds = 0
+    for path, html, seconds in chain(page_html, post_html):
+        if MINIFY_HTML and isinstance(html, str) and path.endswith('.html'):
+            minifying = time.perf_counter()
+            size = len(html.encode('utf-8'))
+            html = minify_html(html)
+            metrics.count('minify_bytes_saved', size - len(html.encode('utf-8')))
+            minify_seconds += time.perf_counter() - minifying
+            seconds += time.perf_counter() - minifying
+        writing = time.perf_counter()
+        report['rendered'].append(path)
+        target = os.path.join(OUTPUT_DIR, path)
+        if isinstance(html, str):
+            body = html.encode('utf-8')
+            written = write_file(target, body)
+        else:
+            body = None
+            written = write_stream(target, html)
+        if written:
+            report['written'].append(path)
+            metrics.count('bytes_written', len(body) if body is not None else os.path.getsize(target))
+        # Unchanged pages too, when PRECOMPRESS or brotli availability changed
+        if written or not compressed_siblings_match(target):
+            if body is None:
+                with open(target, 'rb') as f:
+                    body = f.read()
+            write_compressed(target, body)
+        write_seconds += time.perf_counter() - writing
+        metrics.page(path, seconds + time.perf_counter() - writing)
+    report['skipped'] = len(pages) + len(posts) - len(report['written'])
+    metrics.add_phase('render', time.perf_counter() - rendering - write_seconds - minify_seconds)
+    if MINIFY_HTML:
+        metrics.add_phase('minify', minify_seconds)
+    metrics.add_phase('write', write_seconds)
+    metrics.count('pages_rendered', len(report['rendered']))
+    metrics.count('files_written', len(report['written']))
+
+    # Pages that were built last time but have no inputs any more
+    # (deleted, unpublished or renamed posts)
+    cleaning = time.perf_counter()
+    for path in sorted(set(previous) - set(manifest)):
+        if remove_page(path):
+            report['removed'].append(path)
+
+    save_manifest(manifest)
+    save_render_cache()
+    save_search_cache()
+    metrics.add_phase('cleanup', time.perf_counter() - cleaning)
+    report.update(metrics.summary())
+    return report
+
+def build_site(load, profile=None, **options):
+    """Load the site data with load() and run generate_site() on it.
+
+    Adds the load time to the report's phases. profile='cprofile' or
+    'tracemalloc' (default BUILD_PROFILE) profiles the whole build and adds
+    the top functions or allocations to the report. Unless it is a dry run,
+    the build holds BUILD_LOCK, so builds started by other app workers or
+    build.py wait for it instead of writing the same files, and a summary
+    of the report is saved to BUILD_REPORT.
+    """
+    profile = BUILD_PROFILE if profile is None else profile
+    profiler = cProfile.Profile() if profile == 'cprofile' else None
+    if profiler:
+        profiler.enable()
+    elif profile == 'tracemalloc':
+        tracemalloc.start()
+    try:
+        with nullcontext() if options.get('dry_run') else FileLock(state_path(BUILD_LOCK)):
+            started = time.perf_counter()
+            data = load()
+            loaded = time.perf_counter() - started
+            report = generate_site(data, **options)
+        report['phases'] = {'load': round(loaded, 4), **report['phases'],
+                            'total': round(time.perf_counter() - started, 4)}
+        if profiler:
+            profiler.disable()
+            report['profile'] = profile_summary(profiler)
+        elif profile == 'tracemalloc':
+            report['memory'] = memory_summary()
+    finally:
+        if profiler:
+            profiler.disable()
+        elif profile == 'tracemalloc':
+            tracemalloc.stop()
+
+    if not options.get('dry_run'):
+        save_build_report(report)
+    return report
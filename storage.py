@@ -0,0 +1,834 @@
+# Site data storage: a single JSON file or an SQLite database
+# Flask-free so that the build CLI can read site data without the admin app
+
+import os
+import copy
+import json
+import heapq
+import hashlib
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from locking import FileLock
+
+# Configuration
+DATA_FILE = 'site_data.json'
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'json')  # 'json' or 'sqlite'
+SQLITE_FILE = os.getenv('SQLITE_FILE', 'site_data.db')
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+LOG_COMPACT_BYTES = int(os.getenv('LOG_COMPACT_BYTES', str(1024 * 1024)))  # fold the JSON change log into the snapshot past this size
+
+# Default content for a new data file
+DEFAULT_DATA = {
+    'site_info': {
+        'name': 'Mamdhooh Moomin Rasheed',
+        'title': 'Pentester & Developer',
+        'description': 'Penetration tester and developer with a lifelong passion for breaking systems to build them better.',
+        'email': 'contact@mamdhooh.com',
+        'twitter': '@moominrasheed',
+        'domain': 'mamdhooh.com'
+    },
+    'hero': {
+        'tag': '🛡️ Security · Development · Innovation',
+        'title': 'Mamdhooh Moomin Rasheed',
+        'description': 'Penetration tester and developer with a lifelong passion for breaking systems to build them better. I find vulnerabilities, write code, and secure the digital world one exploit at a time.'
+    },
+    'footer': {
+        'text': '© 2025 Mamdhooh Moomin Rasheed. Built for speed and security.',
+        'tagline': 'root@mamdhooh:~$ whoami'
+    },
+    'expertise': [
+        {
+            'icon': '🔒',
+            'title': 'Penetration Testing',
+            'description': 'Comprehensive security assessments, vulnerability research, and exploit development. I think like an attacker to defend like a pro.'
+        },
+        {
+            'icon': '💻',
+            'title': 'Full-Stack Development',
+            'description': 'Building secure, scalable applications from frontend to backend. Security-first development is not just a practice, it\'s a mindset.'
+        },
+        {
+            'icon': '🔍',
+            'title': 'Security Research',
+            'description': 'Discovering zero-days, analyzing attack vectors, and contributing to the security community with responsible disclosure.'
+        },
+        {
+            'icon': '⚡',
+            'title': 'DevSecOps',
+            'description': 'Integrating security into every stage of development. Automation, CI/CD pipelines, and security tooling that scales.'
+        },
+        {
+            'icon': '🎯',
+            'title': 'Red Team Operations',
+            'description': 'Simulating real-world attacks to test defenses. Social engineering, network penetration, and physical security assessments.'
+        },
+        {
+            'icon': '🛠️',
+            'title': 'Tool Development',
+            'description': 'Creating custom security tools and automation scripts. If it doesn\'t exist, I\'ll build it myself.'
+        }
+    ],
+    'skills': [
+        'Python', 'JavaScript', 'Go', 'Bash', 'React', 'Node.js',
+        'Burp Suite', 'Metasploit', 'Nmap', 'Wireshark', 'Docker',
+        'Kubernetes', 'AWS', 'Linux', 'OWASP', 'Web Application Security',
+        'Network Security', 'Reverse Engineering', 'Binary Exploitation', 'API Security'
+    ],
+    'posts': []
+}
+
+
+def file_mode(path, default=0o644):
+    """Permission bits of path, so a file replaced through a temp file keeps
+    them (mkstemp creates files readable by the owner only)"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        return default
+
+
+class StaleEditError(Exception):
+    """A post was changed by someone else since the editor loaded it"""
+
+
+# Storage backends
+class Storage:
+    """Process-wide cache of the full data set shared by the backends.
+
+    load() only re-reads when version() reports a change, so repeated
+    requests skip parsing. The cached dict is shared: treat it as read-only
+    and hand modified copies to save().
+    """
+
+    # Fields of the lightweight post summaries used by the admin post list
+    SUMMARY_FIELDS = ('id', 'title', 'date', 'category', 'icon', 'published')
+    SORTS = ('date', 'title', 'id')
+
+    def __init__(self):
+        self.cache = None
+        self.cache_version = None
+        self.cache_lock = threading.Lock()
+
+    def load(self):
+        version = self.version()
+        with self.cache_lock:
+            if self.cache is None or self.cache_version != version:
+                self.cache = self.read()
+                self.cache_version = version
+            return self.cache
+
+    def remember(self, data):
+        """Make freshly written data the cached copy"""
+        with self.cache_lock:
+            self.cache = data
+            self.cache_version = self.version()
+
+    def forget(self):
+        with self.cache_lock:
+            self.cache = None
+
+    def update_section(self, name, change):
+        """Replace a section with change(current value), holding the write lock
+        so that concurrent edits of the same section are not lost"""
+        with self.locked():
+            value = change(self.load_section(name))
+            self.save_section(name, value)
+            return value
+
+    @staticmethod
+    def check_version(current, post, expected_version):
+        """Bump post's version past current's, or raise StaleEditError when the
+        editor started from an older version than current"""
+        version = current.get('version', 0)
+        if expected_version is not None and expected_version != version:
+            raise StaleEditError(f"Post {current['id']} was changed by someone else since you opened it")
+        post['version'] = version + 1
+
+    def unique_slug(self, slug, post_id=None):
+        """slug, or slug-2, slug-3, ... when another post already uses it"""
+        slug = slug or 'post'
+        candidate, number = slug, 1
+        while (owner := self.slug_owner(candidate)) is not None and owner != post_id:
+            number += 1
+            candidate = f'{slug}-{number}'
+        return candidate
+
+
+class JsonStorage(Storage):
+    """All site data in a JSON snapshot plus an append-only change log.
+
+    Each edit appends one small record to <path>.log instead of rewriting
+    the snapshot, so its cost does not grow with the archive, and a crash
+    can at most lose a half-written last record. Loading reads the snapshot
+    and replays the records newer than its log_seq. Once the log passes
+    LOG_COMPACT_BYTES it is folded into a new snapshot on a background thread.
+
+    The log starts with the SHA-1 of the snapshot it extends. If the snapshot
+    was edited by hand or by a script since, the edited file wins: the log is
+    ignored and moved aside to <path>.log.stale by the next write.
+
+    Writes hold <path>.lock, so app workers in several processes can edit
+    safely: each write first catches up with the others' records.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.log_path = path + '.log'
+        self.write_lock = threading.RLock()
+        self.file_lock = FileLock(path + '.lock')
+        self.lock_depth = 0
+        self.compacting = False
+        self.log_offset = 0  # end of the last complete log record in the cached data, None if the log is stale
+        self.snapshot_hash = None
+        self.index_source = None
+        self.by_id = {}  # post id -> position in data['posts']
+        self.by_slug = {}  # slug -> post id
+        with self.locked():
+            if not os.path.exists(path):
+                self.save(copy.deepcopy(DEFAULT_DATA))
+            self.repair_log()
+        self.compact_if_needed()
+
+    @contextmanager
+    def locked(self):
+        """Hold the thread and process write locks (re-entrant)"""
+        with self.write_lock:
+            if self.lock_depth == 0:
+                self.file_lock.acquire()
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
+                if self.lock_depth == 0:
+                    self.file_lock.release()
+
+    def version(self):
+        versions = []
+        for path in (self.path, self.log_path):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                versions.append(None)
+            else:
+                versions.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(versions)
+
+    def remember(self, data):
+        # Writers hold the write lock, so the log ends with a complete record
+        with self.cache_lock:
+            self.cache = data
+            self.cache_version = self.version()
+            self.log_offset = self.cache_version[1][1] if self.cache_version[1] else 0
+
+    def read(self):
+        snapshot, log = self.version()
+        cached = self.cache_version
+        if (self.cache is not None and cached and cached[0] == snapshot and log
+                and self.log_offset is not None and log[1] >= self.log_offset):
+            # Only the log grew, through another worker's edits: replay just the new records
+            data = dict(self.cache, posts=list(self.cache['posts']))
+            records, self.log_offset = self.read_log(data.get('log_seq', 0), start=self.log_offset)
+            self.replay(data, records)
+            return data
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        self.snapshot_hash = hashlib.sha1(raw).hexdigest()
+        base = self.log_base()
+        if base is not None and base != self.snapshot_hash:
+            # The snapshot was edited outside this class after the log was started
+            self.log_offset = None
+            return data
+        records, self.log_offset = self.read_log(data.get('log_seq', 0))
+        self.replay(data, records)
+        return data
+
+    def log_base(self):
+        """SHA-1 of the snapshot the log was started on, or None for a missing
+        log or one written before logs had a header"""
+        try:
+            with open(self.log_path, 'rb') as f:
+                first = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return first.get('sha1') if first.get('op') == 'snapshot' else None
+
+    def log_header(self):
+        return json.dumps({'op': 'snapshot', 'sha1': self.snapshot_hash, 'seq': 0}) + '\n'
+
+    def read_log(self, after, start=0):
+        """The change records with a sequence number above after, reading
+        from byte offset start, and the offset just past the last complete
+        record. A record another worker is still appending has no newline
+        yet; it is left for the next read to pick up."""
+        records = []
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return records, 0
+        with f:
+            f.seek(start)
+            end = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                end += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # damaged record
+                if record['seq'] > after:
+                    records.append(record)
+        return records, end
+
+    def replay(self, data, records):
+        """Apply change records to freshly read data in place"""
+        posts = data['posts']
+        positions = {p['id']: i for i, p in enumerate(posts)}
+        for record in records:
+            data['log_seq'] = record['seq']
+            if record['op'] == 'section':
+                data[record['name']] = record['value']
+            elif record['op'] == 'delete_post':
+                position = positions.pop(record['id'], None)
+                if position is not None:
+                    posts[position] = None
+            else:  # insert_post or update_post
+                post = record['post']
+                position = positions.get(post['id'])
+                if position is None:
+                    positions[post['id']] = len(posts)
+                    posts.append(post)
+                else:
+                    posts[position] = post
+                if record['op'] == 'insert_post':
+                    data['post_id_seq'] = max(data.get('post_id_seq', 0), post['id'])
+        data['posts'] = [p for p in posts if p is not None]
+
+    def repair_log(self):
+        """Cut off a record left half-written by a crash, so the next append starts on a new line"""
+        with self.locked():
+            try:
+                with open(self.log_path, 'rb+') as f:
+                    content = f.read()
+                    if content and not content.endswith(b'\n'):
+                        f.truncate(content.rfind(b'\n') + 1)
+            except FileNotFoundError:
+                pass
+
+    def write_snapshot(self, data, replace=True):
+        """Write data to a temp file next to the snapshot and, unless replace is
+        False, move it into place atomically. Returns the temp file path and
+        the SHA-1 of its contents."""
+        raw = json.dumps(data, indent=2).encode('utf-8')
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, file_mode(self.path))
+            if replace:
+                os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        digest = hashlib.sha1(raw).hexdigest()
+        if replace:
+            self.snapshot_hash = digest
+        return tmp_path, digest
+
+    def save(self, data):
+        with self.locked():
+            data = dict(data, log_seq=self.last_seq())
+            try:
+                self.write_snapshot(data)
+                # The snapshot already covers every logged change
+                if os.path.exists(self.log_path):
+                    os.remove(self.log_path)
+            except BaseException:
+                self.forget()
+                raise
+            self.remember(data)
+
+    def last_seq(self):
+        """Sequence number of the newest logged change"""
+        if not os.path.exists(self.path):
+            return 0
+        return self.load().get('log_seq', 0)
+
+    def change(self, record, apply):
+        """Log one change, then apply(data) to a copy of the cached data and cache the result"""
+        with self.locked():
+            data = dict(self.indexed())
+            record['seq'] = data['log_seq'] = data.get('log_seq', 0) + 1
+            line = json.dumps(record, ensure_ascii=False) + '\n'
+            if self.log_offset is None and os.path.exists(self.log_path):
+                os.replace(self.log_path, self.log_path + '.stale')
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                if f.tell() == 0:
+                    line = self.log_header() + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            apply(data)
+            self.remember(data)
+            if self.index_source is not None:
+                self.index_source = data
+        self.compact_if_needed()
+
+    def compact_if_needed(self):
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            return
+        with self.write_lock:
+            if size < LOG_COMPACT_BYTES or self.compacting:
+                return
+            self.compacting = True
+        threading.Thread(target=self.compact, name='log-compaction', daemon=True).start()
+
+    def compact(self):
+        """Fold the change log into a new snapshot while edits carry on"""
+        try:
+            with self.locked():
+                data = self.load()
+                snapshot = self.version()[0]
+            # Written without the lock: records logged meanwhile have a higher
+            # seq than the new snapshot and stay in the rewritten log below
+            tmp_path, digest = self.write_snapshot(data, replace=False)
+            with self.locked():
+                if self.version()[0] != snapshot:
+                    # Another worker replaced the snapshot in the meantime
+                    os.remove(tmp_path)
+                    return
+                current = self.load()  # catch up with records logged meanwhile
+                if self.log_offset is None:
+                    # The log does not belong to this snapshot any more
+                    os.remove(tmp_path)
+                    return
+                os.replace(tmp_path, self.path)
+                self.snapshot_hash = digest
+                tail = [json.dumps(record, ensure_ascii=False) + '\n'
+                        for record in self.read_log(data.get('log_seq', 0))[0]]
+                if tail:
+                    tail.insert(0, self.log_header())
+                    directory = os.path.dirname(os.path.abspath(self.log_path))
+                    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.writelines(tail)
+                    os.chmod(tmp_path, file_mode(self.log_path, file_mode(self.path)))
+                    os.replace(tmp_path, self.log_path)
+                elif os.path.exists(self.log_path):
+                    os.remove(self.log_path)
+                # The cached data is still current, only the files changed
+                with self.cache_lock:
+                    if self.cache is current:
+                        self.cache_version = self.version()
+                        self.log_offset = self.cache_version[1][1] if self.cache_version[1] else 0
+        finally:
+            self.compacting = False
+
+    def load_section(self, name):
+        return copy.deepcopy(self.load().get(name))
+
+    def save_section(self, name, value):
+        def apply(data):
+            data[name] = value
+        self.change({'op': 'section', 'name': name, 'value': value}, apply)
+
+    def indexed(self):
+        """The cached data, with by_id and by_slug matching it. The indexes are
+        rebuilt when the data was reloaded and kept up to date by post edits."""
+        data = self.load()
+        if self.index_source is not data:
+            self.by_id = {p['id']: i for i, p in enumerate(data['posts'])}
+            self.by_slug = {p.get('slug'): p['id'] for p in data['posts']}
+            self.index_source = data
+        return data
+
+    def get_post(self, post_id):
+        data = self.indexed()
+        position = self.by_id.get(post_id)
+        return dict(data['posts'][position]) if position is not None else None
+
+    def slug_owner(self, slug):
+        self.indexed()
+        return self.by_slug.get(slug)
+
+    def next_post_id(self):
+        data = self.load()
+        if 'post_id_seq' in data:
+            return data['post_id_seq'] + 1
+        # Data files written before the sequence was stored
+        return max([p['id'] for p in data['posts']], default=0) + 1
+
+    def insert_post(self, post):
+        """Store a new post under the next id and a unique slug, both set on post"""
+        def apply(data):
+            data['post_id_seq'] = max(self.next_post_id() - 1, post['id'])
+            data['posts'] = data['posts'] + [post]
+            self.by_id[post['id']] = len(data['posts']) - 1
+            self.by_slug[post.get('slug')] = post['id']
+
+        with self.locked():
+            post['id'] = self.next_post_id()
+            post['slug'] = self.unique_slug(post.get('slug'))
+            post['version'] = 1
+            self.change({'op': 'insert_post', 'post': post}, apply)
+
+    def insert_posts(self, posts):
+        """Store an iterable of new posts like insert_post, all or none of them.
+
+        The posts are added to a copy of the data and written as one new
+        snapshot, so an error raised while iterating leaves the data as it was.
+        Returns the number of posts stored.
+        """
+        with self.locked():
+            data = dict(self.indexed())
+            data['posts'] = list(data['posts'])
+            first_id = post_id = self.next_post_id()
+            try:
+                for post in posts:
+                    post['id'] = post_id
+                    post['slug'] = self.unique_slug(post.get('slug'))
+                    post['version'] = 1
+                    # Keep the indexes in step so slugs stay unique within the import
+                    self.by_id[post_id] = len(data['posts'])
+                    self.by_slug[post['slug']] = post_id
+                    data['posts'].append(post)
+                    post_id += 1
+                data['post_id_seq'] = post_id - 1
+                self.save(data)
+            except BaseException:
+                self.index_source = None  # the indexes include posts that were not stored
+                raise
+            self.index_source = self.cache
+            return post_id - first_id
+
+    def iter_posts(self):
+        """Every post in storage order"""
+        return iter(self.load()['posts'])
+
+    def update_post(self, post, expected_version=None):
+        """Replace a post, keeping its slug unique. Raises StaleEditError if
+        expected_version is given and the stored post has moved on."""
+        def apply(data):
+            position = self.by_id[post['id']]
+            old_slug = data['posts'][position].get('slug')
+            data['posts'] = list(data['posts'])
+            data['posts'][position] = post
+            if self.by_slug.get(old_slug) == post['id']:
+                del self.by_slug[old_slug]
+            self.by_slug[post.get('slug')] = post['id']
+
+        with self.locked():
+            current = self.get_post(post['id'])
+            if current is None:
+                return
+            self.check_version(current, post, expected_version)
+            post['slug'] = self.unique_slug(post.get('slug'), post['id'])
+            self.change({'op': 'update_post', 'post': post}, apply)
+
+    def delete_post(self, post_id):
+        def apply(data):
+            data['posts'] = [p for p in data['posts'] if p['id'] != post_id]
+            self.index_source = None
+        self.change({'op': 'delete_post', 'id': post_id}, apply)
+
+    def list_post_summaries(self, offset=0, limit=25, sort='date', descending=True,
+                            category=None, published=None, search=None):
+        """One page of post summaries and the number of posts matching the filters"""
+        posts = self.load()['posts']
+        if category:
+            posts = [p for p in posts if p.get('category') == category]
+        if published is not None:
+            posts = [p for p in posts if bool(p.get('published', True)) == published]
+        if search:
+            needle = search.lower()
+            posts = [p for p in posts if needle in p.get('title', '').lower()]
+
+        if sort == 'title':
+            key = lambda p: (p.get('title', '').lower(), p['id'])
+        elif sort == 'id':
+            key = lambda p: p['id']
+        else:
+            key = lambda p: (p.get('date', ''), p['id'])
+        # Only the posts up to the requested page need ordering
+        select = heapq.nlargest if descending else heapq.nsmallest
+        page = select(offset + limit, posts, key=key)[offset:]
+        summaries = [dict({field: p.get(field) for field in self.SUMMARY_FIELDS},
+                          published=bool(p.get('published', True))) for p in page]
+        return summaries, len(posts)
+
+    def post_categories(self):
+        return sorted({p['category'] for p in self.load()['posts'] if p.get('category')})
+
+
+class SqliteStorage(Storage):
+    """Site data in SQLite with one row per post, expertise card and skill.
+
+    Post edits touch a single row instead of rewriting the whole archive.
+    site_info, hero and footer are kept as JSON in the settings table and
+    post fields without a column of their own go to posts.extra. Every
+    write bumps meta.version, which tells other workers to drop their cache.
+    Writes run in BEGIN IMMEDIATE transactions, so read-modify-write cycles
+    are serialized across workers.
+    """
+
+    POST_COLUMNS = ('id', 'title', 'slug', 'excerpt', 'content', 'category',
+                    'icon', 'date', 'read_time', 'published')
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS expertise (position INTEGER PRIMARY KEY, icon TEXT, title TEXT, description TEXT);
+        CREATE TABLE IF NOT EXISTS skills (position INTEGER PRIMARY KEY, name TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY, position INTEGER NOT NULL, title TEXT, slug TEXT, excerpt TEXT,
+            content TEXT, category TEXT, icon TEXT, date TEXT, read_time TEXT,
+            published INTEGER NOT NULL DEFAULT 1, extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS posts_position ON posts (position);
+        CREATE INDEX IF NOT EXISTS posts_slug ON posts (slug);
+        CREATE INDEX IF NOT EXISTS posts_published ON posts (published, position);
+        CREATE INDEX IF NOT EXISTS posts_date ON posts (date);
+        CREATE INDEX IF NOT EXISTS posts_category ON posts (category);
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO meta (name, value) VALUES ('version', 0);
+        INSERT OR IGNORE INTO meta (name, value) VALUES ('post_id_seq', 0);
+    '''
+    SETTINGS = ('site_info', 'hero', 'footer')
+    INSERT_POST = (f'INSERT INTO posts ({", ".join(POST_COLUMNS)}, extra, position) '
+                   f'VALUES ({", ".join("?" * (len(POST_COLUMNS) + 2))})')
+    UPDATE_POST = f'UPDATE posts SET {", ".join(f"{c} = ?" for c in POST_COLUMNS)}, extra = ? WHERE id = ?'
+
+    def __init__(self, path, json_path=None):
+        super().__init__()
+        self.path = path
+        self.local = threading.local()
+        self.db.executescript(self.SCHEMA)
+        with self.locked():
+            if self.db.execute('SELECT COUNT(*) FROM settings').fetchone()[0] == 0:
+                self.migrate(json_path)
+
+    @property
+    def db(self):
+        """One connection per thread"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self.local.conn = conn
+        return conn
+
+    @contextmanager
+    def locked(self):
+        """Write transaction that takes the database write lock up front, so
+        reads inside it see the latest data (re-entrant)"""
+        if self.db.in_transaction:
+            yield
+            return
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+
+    def migrate(self, json_path):
+        """One-shot import of an existing JSON data file into an empty database"""
+        if json_path and os.path.exists(json_path):
+            data = JsonStorage(json_path).load()
+        else:
+            data = copy.deepcopy(DEFAULT_DATA)
+        self.save(data)
+
+    def post_values(self, post):
+        """Column values for a post followed by the JSON of any extra fields"""
+        extra = {k: v for k, v in post.items() if k not in self.POST_COLUMNS}
+        values = [post.get(column) for column in self.POST_COLUMNS]
+        values[self.POST_COLUMNS.index('published')] = int(post.get('published', True))
+        return values + [json.dumps(extra) if extra else None]
+
+    def row_post(self, row):
+        post = {column: row[column] for column in self.POST_COLUMNS}
+        post['published'] = bool(post['published'])
+        if row['extra']:
+            post.update(json.loads(row['extra']))
+        return post
+
+    def write_section(self, name, value):
+        if name == 'expertise':
+            self.db.execute('DELETE FROM expertise')
+            self.db.executemany(
+                'INSERT INTO expertise (position, icon, title, description) VALUES (?, ?, ?, ?)',
+                [(i, e['icon'], e['title'], e['description']) for i, e in enumerate(value)]
+            )
+        elif name == 'skills':
+            self.db.execute('DELETE FROM skills')
+            self.db.executemany('INSERT INTO skills (position, name) VALUES (?, ?)', list(enumerate(value)))
+        else:
+            self.db.execute('INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)',
+                            (name, json.dumps(value)))
+
+    def load_section(self, name):
+        if name == 'expertise':
+            rows = self.db.execute('SELECT icon, title, description FROM expertise ORDER BY position')
+            return [dict(row) for row in rows]
+        if name == 'skills':
+            return [row['name'] for row in self.db.execute('SELECT name FROM skills ORDER BY position')]
+        if name == 'posts':
+            return [self.row_post(row) for row in self.db.execute('SELECT * FROM posts ORDER BY position')]
+        row = self.db.execute('SELECT value FROM settings WHERE name = ?', (name,)).fetchone()
+        return json.loads(row['value']) if row else None
+
+    def version(self):
+        return self.db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()[0]
+
+    def touch(self):
+        """Mark the data as changed; call inside the write transaction"""
+        self.db.execute("UPDATE meta SET value = value + 1 WHERE name = 'version'")
+
+    def read(self):
+        data = {name: self.load_section(name) for name in self.SETTINGS}
+        for name in ('expertise', 'skills', 'posts'):
+            data[name] = self.load_section(name)
+        return data
+
+    def save(self, data):
+        with self.locked():
+            for name in self.SETTINGS + ('expertise', 'skills'):
+                if name in data:
+                    self.write_section(name, data[name])
+            self.db.execute('DELETE FROM posts')
+            self.db.executemany(
+                self.INSERT_POST,
+                [self.post_values(post) + [i] for i, post in enumerate(data.get('posts', []))]
+            )
+            self.advance_post_id_seq(max([data.get('post_id_seq', 0)] + [p['id'] for p in data.get('posts', [])]))
+            self.touch()
+        self.remember(data)
+
+    def save_section(self, name, value):
+        with self.locked():
+            self.write_section(name, value)
+            self.touch()
+
+    def get_post(self, post_id):
+        row = self.db.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
+        return self.row_post(row) if row else None
+
+    def next_post_id(self):
+        # Ids of deleted posts are never handed out again
+        return self.db.execute(
+            "SELECT MAX(value, (SELECT COALESCE(MAX(id), 0) FROM posts)) + 1 FROM meta WHERE name = 'post_id_seq'"
+        ).fetchone()[0]
+
+    def slug_owner(self, slug):
+        row = self.db.execute('SELECT id FROM posts WHERE slug = ? LIMIT 1', (slug,)).fetchone()
+        return row['id'] if row else None
+
+    def advance_post_id_seq(self, post_id):
+        self.db.execute("UPDATE meta SET value = MAX(value, ?) WHERE name = 'post_id_seq'", (post_id,))
+
+    def insert_post(self, post):
+        """Store a new post under the next id and a unique slug, both set on post"""
+        with self.locked():
+            post['id'] = self.next_post_id()
+            post['slug'] = self.unique_slug(post.get('slug'))
+            post['version'] = 1
+            position = self.db.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM posts').fetchone()[0]
+            self.db.execute(self.INSERT_POST, self.post_values(post) + [position])
+            self.advance_post_id_seq(post['id'])
+            self.touch()
+
+    def insert_posts(self, posts):
+        """Store an iterable of new posts like insert_post, all or none of them.
+
+        Everything runs in one transaction, which is rolled back if iterating
+        raises. Posts are written as they arrive, so memory use does not grow
+        with the number of posts. Returns the number of posts stored.
+        """
+        with self.locked():
+            first_id = post_id = self.next_post_id()
+            position = self.db.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM posts').fetchone()[0]
+            for post in posts:
+                post['id'] = post_id
+                post['slug'] = self.unique_slug(post.get('slug'))
+                post['version'] = 1
+                self.db.execute(self.INSERT_POST, self.post_values(post) + [position])
+                post_id += 1
+                position += 1
+            self.advance_post_id_seq(post_id - 1)
+            self.touch()
+            return post_id - first_id
+
+    def iter_posts(self):
+        """Every post in storage order, read from the database as iterated"""
+        for row in self.db.execute('SELECT * FROM posts ORDER BY position'):
+            yield self.row_post(row)
+
+    def update_post(self, post, expected_version=None):
+        """Replace a post, keeping its slug unique. Raises StaleEditError if
+        expected_version is given and the stored post has moved on."""
+        with self.locked():
+            current = self.get_post(post['id'])
+            if current is None:
+                return
+            self.check_version(current, post, expected_version)
+            post['slug'] = self.unique_slug(post.get('slug'), post['id'])
+            self.db.execute(self.UPDATE_POST, self.post_values(post) + [post['id']])
+            self.touch()
+
+    def delete_post(self, post_id):
+        with self.locked():
+            self.db.execute('DELETE FROM posts WHERE id = ?', (post_id,))
+            self.touch()
+
+    def list_post_summaries(self, offset=0, limit=25, sort='date', descending=True,
+                            category=None, published=None, search=None):
+        """One page of post summaries and the number of posts matching the filters"""
+        where, params = [], []
+        if category:
+            where.append('category = ?')
+            params.append(category)
+        if published is not None:
+            where.append('published = ?')
+            params.append(int(published))
+        if search:
+            where.append("title LIKE ? ESCAPE '\\'")
+            params.append('%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        where = f"WHERE {' AND '.join(where)}" if where else ''
+        direction = 'DESC' if descending else 'ASC'
+        column = {'title': 'title COLLATE NOCASE', 'id': 'id'}.get(sort, 'date')
+
+        total = self.db.execute(f'SELECT COUNT(*) FROM posts {where}', params).fetchone()[0]
+        rows = self.db.execute(
+            f'SELECT {", ".join(self.SUMMARY_FIELDS)} FROM posts {where} '
+            f'ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?',
+            params + [limit, offset]
+        )
+        return [dict(row, published=bool(row['published'])) for row in rows], total
+
+    def post_categories(self):
+        rows = self.db.execute('SELECT DISTINCT category FROM posts WHERE category IS NOT NULL ORDER BY category')
+        return [row['category'] for row in rows if row['category']]
+
+
+def open_storage(path=None):
+    """Open the configured backend, or the one matching the extension of path"""
+    if path is None:
+        if STORAGE_BACKEND == 'sqlite':
+            return SqliteStorage(SQLITE_FILE, json_path=DATA_FILE)
+        return JsonStorage(DATA_FILE)
+    if path.endswith(SQLITE_SUFFIXES):
+        return SqliteStorage(path)
+    return JsonStorage(path)
@@ -0,0 +1,35 @@
+import pytest
+
+from sitegen import markdown_to_html
+
+# Output of the converter before it was rewritten to run in linear time,
+# quirks included: links are left as written and HTML is not escaped
+GOLDEN = [
+    ('# Title\n## Section\n### Subsection\n#### Not a header',
+     '<h2>Title</h2><h2>Section</h2><h3>Subsection</h3><p>#### Not a header</p>'),
+    ('- one\n* two\n  - indented\n\n1. first\n2. second\n10. tenth\nafter',
+     '<ul><li>one</li><li>two</li><li>indented</li></ul>'
+     '<ol><li>first</li><li>second</li><li>tenth</li></ol><p>after</p>'),
+    ('- item\n# Header\n> quote',
+     '<ul><li>item</li></ul><h2>Header</h2><blockquote>quote</blockquote>'),
+    ('Before\n```python\nx = a ** b\n  _private_ = `tick`\n\n```\nAfter',
+     '<p>Before</p><pre><code>x = a ** b\n  _private_ = `tick`</code></pre><p>After</p>'),
+    ('```\ncode never closed', ''),
+    ('Call `run()` then `stop()` and a lone ` tick',
+     '<p>Call <code>run()</code> then <code>stop()</code> and a lone ` tick</p>'),
+    ('Some **bold** and _italic_ and **unclosed bold, snake_case_name',
+     '<p>Some <strong>bold</strong> and <em>italic</em> and <strong>unclosed bold, snake<em>case</em>name</p>'),
+    ('**bold _italic_ `code`** _a_b_c_',
+     '<p><strong>bold <em>italic</em> <code>code</code></strong> <em>a</em>b<em>c</em></p>'),
+    ('See [the docs](https://example.com/a_b_c) and <https://example.com>',
+     '<p>See [the docs](https://example.com/a<em>b</em>c) and <https://example.com></p>'),
+    ('Tags <script>alert(1)</script> & entities &amp; "quotes" \'single\'',
+     '<p>Tags <script>alert(1)</script> & entities &amp; "quotes" \'single\'</p>'),
+    ('```\n<b>not bold</b> & done\n```', '<pre><code><b>not bold</b> & done</code></pre>'),
+    ('\n\n   \nText\n\n\n', '<p>Text</p>'),
+]
+
+
+@pytest.mark.parametrize('text, html', GOLDEN)
+def test_markdown_matches_the_original_converter(text, html):
+    assert markdown_to_html(text) == html
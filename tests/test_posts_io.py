@@ -0,0 +1,17 @@
+import pytest
+
+from posts_io import format_markdown, parse_markdown
+
+
+@pytest.mark.parametrize('content', [
+    'Body', '', '\nStarts with a blank line', 'Ends with blank lines\n\n', '\n\n```\ncode\n```\n'
+])
+def test_markdown_round_trip_keeps_content_newlines(content):
+    post = {'id': 1, 'title': 'Newlines', 'slug': 'newlines', 'content': content, 'published': True}
+    fields = parse_markdown(format_markdown(post))
+    assert fields['content'] == content
+    assert fields['title'] == 'Newlines' and fields['published'] is True
+
+
+def test_markdown_without_front_matter_keeps_leading_newlines():
+    assert parse_markdown('\ufeff\n# Heading\n') == {'content': '\n# Heading'}
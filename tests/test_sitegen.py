@@ -0,0 +1,202 @@
+import os
+import json
+import copy
+import types
+
+import pytest
+
+import sitegen
+from storage import DEFAULT_DATA
+
+
+def make_post(post_id, title, category='SECURITY'):
+    return {
+        'id': post_id, 'title': title, 'slug': sitegen.create_slug(title), 'excerpt': f'About {title}',
+        'content': f'Body of {title}', 'category': category, 'icon': '🔒',
+        'date': f'2025-01-{post_id:02d}', 'read_time': '1 min', 'published': True
+    }
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Build into a temp directory; returns a function reading an output page"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sitegen, 'OUTPUT_DIR', 'public')
+
+    def page(path):
+        with open(os.path.join('public', path), encoding='utf-8') as f:
+            return f.read()
+    return page
+
+
+def test_post_titled_categories_does_not_replace_the_overview(site):
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['posts'] = [make_post(1, 'Categories')]
+    sitegen.generate_site(data, jobs=1)
+
+    assert 'class="article-content"' in site('blog/categories.html')
+    overview = site('blog/categories/index.html')
+    assert 'class="article-content"' not in overview
+    assert 'href="../category/security.html"' in overview
+
+    # A second build finds both pages up to date
+    assert sitegen.generate_site(data, jobs=1)['written'] == []
+
+
+def test_search_index_fits_its_budget_at_archive_scale(site):
+    from bench import synthetic_data
+
+    posts = [post for post in synthetic_data(10000)['posts'] if post['published']]
+    index = sitegen.build_search_index(posts)
+    assert len(index.encode('utf-8')) <= sitegen.SEARCH_INDEX_MAX_BYTES
+
+    terms = json.loads(index)['terms']
+    shards = sitegen.search_doc_shards(posts)
+    assert sum(len(shard) for shard in shards) == len(posts)
+    # A rare word (the number in a title) still finds its post
+    number = len(posts) // 2
+    target = posts[number]
+    hits = terms[target['title'].split()[-1]]
+    assert number in hits
+    title, slug, _ = shards[number // sitegen.SEARCH_SHARD_SIZE][number % sitegen.SEARCH_SHARD_SIZE]
+    assert (title, slug) == (target['title'], target['slug'])
+
+
+@pytest.fixture
+def state(site, tmp_path, monkeypatch):
+    """Keep build state next to a data file in its own directory, starting
+    with an empty in-memory render cache"""
+    monkeypatch.setattr(sitegen, 'STATE_DIR', '')
+    monkeypatch.setattr(sitegen, '_render_cache', {})
+    monkeypatch.setattr(sitegen, '_render_cache_size', {})
+    monkeypatch.setattr(sitegen, '_render_cache_dirty', set())
+    sitegen.set_state_dir(str(tmp_path / 'data' / 'site_data.json'))
+    return tmp_path / 'data'
+
+
+def read_shards(directory):
+    return {name: (directory / name).read_text(encoding='utf-8') for name in os.listdir(directory)}
+
+
+def test_single_post_rebuild_rewrites_one_render_cache_shard(state, monkeypatch):
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['posts'] = [make_post(number, f'Post {number}') for number in range(1, 41)]
+    sitegen.generate_site(data, jobs=1)
+    assert not os.path.exists(sitegen.BUILD_MANIFEST)
+    assert (state / sitegen.BUILD_MANIFEST).exists()
+    before = read_shards(state / sitegen.RENDER_CACHE)
+    assert len(before) > 1
+
+    # A fresh process reads the cache back; hits alone change nothing
+    monkeypatch.setattr(sitegen, '_render_cache', {})
+    sitegen.generate_site(data, full=True, jobs=1)
+    assert read_shards(state / sitegen.RENDER_CACHE) == before
+
+    data['posts'][7]['content'] += '\n\nOne more paragraph.'
+    sitegen.generate_site(data, jobs=1)
+    after = read_shards(state / sitegen.RENDER_CACHE)
+    assert [name for name in after if after[name] != before.get(name)] == [
+        f"{int(sitegen.render_cache_key(data['posts'][7]['content'])[0], 16):x}.json"]
+
+
+def test_render_cache_cap_counts_utf8_bytes(state, monkeypatch):
+    monkeypatch.setattr(sitegen, 'RENDER_CACHE_MAX_BYTES', 3000 * sitegen.RENDER_CACHE_SHARDS)
+    texts = [f'text {number}' for number in range(200)]
+    shard = sitegen.render_cache_key(texts[0])[0]
+    same_shard = [text for text in texts if sitegen.render_cache_key(text)[0] == shard][:2]
+    for text in same_shard:
+        sitegen.render_cache_put(text, '€' * 900)  # 900 characters, 2700 bytes
+
+    assert sitegen.render_cache_get(same_shard[0]) is None
+    assert sitegen.render_cache_get(same_shard[1]) == '€' * 900
+
+
+def test_listings_start_with_the_newest_posts(site):
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['site_info']['posts_per_page'] = 2
+    data['posts'] = [make_post(number, f'Post {number}') for number in range(1, 6)]
+    sitegen.generate_site(data, jobs=1)
+
+    def slugs(path):
+        return [slug for slug in ('post-1', 'post-2', 'post-3', 'post-4', 'post-5')
+                if f'blog/{slug}.html"' in site(path)]
+
+    assert slugs('blog.html') == ['post-4', 'post-5']
+    assert 'Older Posts' in site('blog.html')
+    assert slugs('blog/page/3.html') == ['post-1']
+    assert slugs('blog/category/security.html') == ['post-4', 'post-5']
+    assert 'blog/post-5.html' in site('index.html')
+
+
+def test_precompressed_siblings_follow_brotli_availability(site, monkeypatch):
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['posts'] = [make_post(1, 'Compressed')]
+    monkeypatch.setattr(sitegen, 'PRECOMPRESS', True)
+    monkeypatch.setattr(sitegen, 'brotli', None)
+    sitegen.generate_site(data, jobs=1)
+    assert os.path.exists('public/blog/compressed.html.gz')
+    assert not os.path.exists('public/blog/compressed.html.br')
+
+    # Installing brotli re-renders pages to the same bytes; .br must still appear
+    monkeypatch.setattr(sitegen, 'brotli', types.SimpleNamespace(compress=lambda data, quality: b'br:' + data))
+    report = sitegen.generate_site(data, jobs=1)
+    assert report['written'] == []
+    assert os.path.exists('public/blog/compressed.html.br')
+
+    monkeypatch.setattr(sitegen, 'brotli', None)
+    sitegen.generate_site(data, jobs=1)
+    assert not os.path.exists('public/blog/compressed.html.br')
+    assert os.path.exists('public/blog/compressed.html.gz')
+
+
+def test_feed_keeps_the_newest_posts_of_the_same_day(site, monkeypatch):
+    monkeypatch.setattr(sitegen, 'FEED_SIZE', 2)
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['posts'] = [dict(make_post(number, f'Post {number}'), date='2025-02-01') for number in range(1, 4)]
+    sitegen.generate_site(data, jobs=1)
+
+    feed = site('feed.xml')
+    assert 'post-1.html' not in feed
+    assert feed.index('post-3.html') < feed.index('post-2.html')
+
+
+def test_blog_listing_keeps_its_meta_description(site):
+    data = copy.deepcopy(DEFAULT_DATA)
+    data['posts'] = [make_post(1, 'Described')]
+    sitegen.generate_site(data, jobs=1)
+
+    blog = site('blog.html')
+    assert ('<meta name="description" content="Security insights, development tips, '
+            'and penetration testing techniques">') in blog
+    assert 'Thoughts on security, development, and breaking things the right way</p>' in blog
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+@pytest.mark.parametrize('pool', ['process', 'thread'])
+def test_parallel_build_matches_serial_build(state, tmp_path, monkeypatch, pool):
+    from bench import synthetic_data
+
+    data = synthetic_data(60)
+    trees = {}
+    for jobs in (1, 3):
+        # Each build starts cold, with its own output and build state
+        monkeypatch.setattr(sitegen, 'OUTPUT_DIR', f'public-{jobs}')
+        monkeypatch.setattr(sitegen, '_render_cache', {})
+        sitegen.set_state_dir(str(tmp_path / f'state-{jobs}' / 'site_data.json'))
+        sitegen.generate_site(data, jobs=jobs, pool=pool)
+        trees[jobs] = read_tree(f'public-{jobs}')
+    assert len(trees[1]) > len(data['posts'])
+    assert trees[1] == trees[3]
+
+    # An incremental build of unchanged data writes nothing
+    report = sitegen.generate_site(data, jobs=3, pool=pool)
+    assert report['written'] == [] and report['rendered'] == []
@@ -0,0 +1,110 @@
+import os
+import stat
+import json
+import multiprocessing
+
+from storage import JsonStorage
+
+
+def append_hero_edits(path, count):
+    storage = JsonStorage(path)
+    for i in range(count):
+        storage.save_section('hero', {'title': f'edit {i}'})
+
+
+def test_record_being_appended_is_applied_by_the_next_read(tmp_path):
+    path = str(tmp_path / 'site_data.json')
+    reader = JsonStorage(path)
+    writer = JsonStorage(path)
+    writer.save_section('hero', {'title': 'first'})
+    assert reader.load()['hero'] == {'title': 'first'}
+
+    # Another worker is halfway through appending a record
+    record = json.dumps({'op': 'section', 'name': 'hero', 'value': {'title': 'second'}, 'seq': 2}) + '\n'
+    with open(path + '.log', 'a', encoding='utf-8') as f:
+        f.write(record[:20])
+    assert reader.load()['hero'] == {'title': 'first'}
+    with open(path + '.log', 'a', encoding='utf-8') as f:
+        f.write(record[20:])
+    assert reader.load()['hero'] == {'title': 'second'}
+
+    # The reader's own writes must not drop the record either
+    reader.save_section('footer', {'text': 'x', 'tagline': 'y'})
+    assert JsonStorage(path).load()['hero'] == {'title': 'second'}
+
+
+def test_concurrent_appends_are_all_seen_by_a_reader(tmp_path):
+    path = str(tmp_path / 'site_data.json')
+    reader = JsonStorage(path)
+    writers = [multiprocessing.Process(target=append_hero_edits, args=(path, 200)) for _ in range(2)]
+    for process in writers:
+        process.start()
+    while any(process.is_alive() for process in writers):
+        reader.load()
+    for process in writers:
+        process.join()
+
+    data = reader.load()
+    assert data['log_seq'] == 400
+    assert data == JsonStorage(path).load()
+
+
+def edit_snapshot(path, change):
+    with open(path) as f:
+        data = json.load(f)
+    change(data)
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def test_hand_edited_snapshot_wins_over_the_log(tmp_path):
+    path = str(tmp_path / 'site_data.json')
+    storage = JsonStorage(path)
+    storage.save_section('hero', {'title': 'logged'})
+    edit_snapshot(path, lambda data: data.update(hero={'title': 'manual edit'}))
+
+    assert JsonStorage(path).load()['hero'] == {'title': 'manual edit'}
+    assert storage.load()['hero'] == {'title': 'manual edit'}
+
+    # The next edit starts a new log on top of the edited snapshot
+    storage.save_section('footer', {'text': 'x', 'tagline': 'y'})
+    data = JsonStorage(path).load()
+    assert data['hero'] == {'title': 'manual edit'}
+    assert data['footer'] == {'text': 'x', 'tagline': 'y'}
+    assert (tmp_path / 'site_data.json.log.stale').exists()
+
+
+def test_compaction_keeps_the_log_valid(tmp_path):
+    path = str(tmp_path / 'site_data.json')
+    storage = JsonStorage(path)
+    for i in range(3):
+        storage.save_section('hero', {'title': f'edit {i}'})
+    storage.compacting = True
+    storage.compact()
+    storage.save_section('footer', {'text': 'after', 'tagline': 'compaction'})
+    data = JsonStorage(path).load()
+    assert data['hero'] == {'title': 'edit 2'}
+    assert data['footer'] == {'text': 'after', 'tagline': 'compaction'}
+
+
+def test_compaction_keeps_file_permissions(tmp_path):
+    path = str(tmp_path / 'site_data.json')
+    storage = JsonStorage(path)
+    storage.save(storage.load())
+    storage.save_section('hero', {'title': 'before'})
+    os.chmod(path, 0o664)
+    os.chmod(path + '.log', 0o664)
+
+    # Another worker logs an edit while the new snapshot is written
+    write_snapshot = storage.write_snapshot
+    def write_snapshot_during_edit(data, replace=True):
+        written = write_snapshot(data, replace)
+        JsonStorage(path).save_section('hero', {'title': 'during'})
+        return written
+    storage.write_snapshot = write_snapshot_during_edit
+    storage.compacting = True
+    storage.compact()
+
+    assert JsonStorage(path).load()['hero'] == {'title': 'during'}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o664
+    assert stat.S_IMODE(os.stat(path + '.log').st_mode) == 0o664